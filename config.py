@@ -1,5 +1,4 @@
 """Конфигурация игры"""
-import pygame
 
 # Пути к ресурсам
 ASSETS_PATH = "assets/"
@@ -13,6 +12,14 @@ DEFAULT_SETTINGS = {
     "sound_volume": 0.7,
     "selected_background": 0,
 }
+SAVE_FLUSH_INTERVAL = 5.0  # секунд: дольше несохранённые изменения не ждут
+RUN_HISTORY_FILE = "run_history.db"
+RUN_HISTORY_BATCH = 16              # законченных партий в одной транзакции
+RUN_HISTORY_FLUSH_INTERVAL = 30.0   # секунд: дольше партии в памяти не ждут
+
+# Шрифт интерфейса и размер кэша отрисованного текста
+DEFAULT_FONT = "freesansbold.ttf"
+TEXT_CACHE_SIZE = 256
 
 # Размеры экрана
 SCREEN_WIDTH = 800
@@ -29,8 +36,13 @@ GOLD = (255, 215, 0)
 ORANGE = (255, 165, 0)
 GRAY = (128, 128, 128)
 
-# FPS
+# FPS — частота отрисовки; физика идёт фиксированными шагами SIMULATION_RATE
 FPS = 60
+SIMULATION_RATE = 60
+MAX_FRAME_TIME = 0.25  # сек: дольше за кадр не догоняем, чтобы не уйти в «спираль»
+
+# Обновлять на дисплее только изменившиеся области (для слабых машин)
+DIRTY_RECT_RENDERING = False
 
 # Размеры блоков – под tower_x_*.png (96x48)
 BLOCK_WIDTH = 96
@@ -40,15 +52,47 @@ BLOCK_HEIGHT = 48
 TOWER_PART_WIDTH = BLOCK_WIDTH
 TOWER_PART_HEIGHT = BLOCK_HEIGHT
 TOWER_MID_PARTS_COUNT = 4
+ATLAS_PAGE_WIDTH = 1024  # ширина страницы атласа частей башен
 
 # Физика блока
 GRAVITY = 0.5
 ROPE_LENGTH = 150
 ORIGIN = (400, 3)
 
+# Таблицы траекторий маятника: сколько шагов досчитывать за раз, предел
+# длины таблицы (дальше блок считается шагами) и сколько таблиц хранить
+TRAJECTORY_CHUNK = 256
+TRAJECTORY_MAX_STEPS = 16384
+TRAJECTORY_CACHE_SIZE = 64
+
+# При сдвиге больше этого за один шаг (респаун, новый этаж) позиция
+# не интерполируется, а сразу перескакивает
+INTERPOLATION_SNAP = BLOCK_HEIGHT
+
+# Кэш поворотов падающего блока: шаг угла в градусах и число хранимых кадров
+ROTATION_STEP = 1
+ROTATION_CACHE_SIZE = 256
+
 # Настройки башни
 SCROLL_SPEED = 5
+
+# Камера: прокрутка вверх за башней и спуск к земле после потерянной жизни
+TOWER_SCROLL_LINE = 440     # верх башни прокручивается вниз до этой линии экрана
+TOWER_SCROLLED_HEIGHT = 160 # видимая высота башни после прокрутки
+TOWER_SCROLLED_FLOORS = 3   # этажей на экране после прокрутки
+TOWER_MAX_ONSCREEN = 7      # столько этажей на экране — при респауне окно сдвигается
+CAMERA_DESCENT_SPEED = 10
 MAX_LIVES = 3
+TOWER_CANVAS_FLOORS = 8  # этажей на постоянном холсте башни
+
+# Устойчивость: сдвиг центра масс этажей над основанием от центра основания (px)
+TOWER_WOBBLE_LEAN = 4        # с такого сдвига башня (от 5 этажей) раскачивается
+TOWER_COLLAPSE_LEAN = 44     # при таком — рушится
+TOWER_WOBBLE_AMPLITUDE = 20  # размах раскачивания при сдвиге TOWER_COLLAPSE_LEAN
+TOWER_WOBBLE_MIN_SHARE = 0.25  # доля размаха у ровной башни (раскачка с 20 этажей)
+# Верхние подстопки: этажи выше floor рушатся, если их центр масс ушёл за край floor
+TOWER_SUBSTACK_DEPTH = 3     # сколько верхних этажей проверять как опору
+TOWER_SUBSTACK_OVERHANG = BLOCK_WIDTH // 2  # дальше края опорного этажа — подстопка падает
 
 # Скины башен
 TOWER_SKINS = {
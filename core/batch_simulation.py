@@ -0,0 +1,421 @@
+"""
+Пакетная симуляция: N независимых партий в массивах NumPy.
+
+Те же правила, что в core.simulation (swing/drop/collided/collapse, прокрутка,
+раскачивание, жизни), но шаг делается сразу для всех партий масками.
+Нужен для подбора GRAVITY, ROPE_LENGTH, INITIAL_FORCE и FORCE_MULTIPLIER
+без ручной игры. Требует numpy (в самой игре не используется).
+
+Момент отпускания задаёт массив политики delays: блок отпускается, когда он
+провисел на верёвке delays[i] шагов. Форма (N,) — одна задержка на партию,
+(N, K) — своя задержка для каждого броска (по кругу). play_scalar() играет
+ту же политику на обычной Simulation — для сверки результатов.
+"""
+import numpy as np
+from core.simulation import Simulation
+from config import (
+    GRAVITY,
+    ROPE_LENGTH,
+    BLOCK_HEIGHT,
+    BLOCK_WIDTH,
+    SCROLL_SPEED,
+    MAX_LIVES,
+    INITIAL_FORCE,
+    FORCE_MULTIPLIER,
+    TOWER_WOBBLE_LEAN,
+    TOWER_COLLAPSE_LEAN,
+    TOWER_SUBSTACK_DEPTH,
+    TOWER_SUBSTACK_OVERHANG,
+    TOWER_WOBBLE_AMPLITUDE,
+    TOWER_WOBBLE_MIN_SHARE,
+    TOWER_SCROLL_LINE,
+    TOWER_SCROLLED_HEIGHT,
+    TOWER_SCROLLED_FLOORS,
+    TOWER_MAX_ONSCREEN,
+    CAMERA_DESCENT_SPEED,
+)
+
+# состояния блока (BlockModel.state)
+READY, DROPPED, LANDED, SCROLL, OVER, MISS = range(6)
+
+HALF_WIDTH = BLOCK_WIDTH // 2
+
+
+class BatchSimulation:
+    def __init__(
+        self,
+        count,
+        gravity=GRAVITY,
+        rope_length=ROPE_LENGTH,
+        initial_force=INITIAL_FORCE,
+        force_multiplier=FORCE_MULTIPLIER,
+        floor_bins=64,
+    ):
+        """
+        Параметры — число или массив на count партий.
+        floor_bins — сколько этажей различать в поэтажной статистике
+        (всё выше попадает в последнюю ячейку).
+        """
+        self.count = count
+        n = count
+
+        def param(value):
+            return np.broadcast_to(np.asarray(value, dtype=np.float64), (n,)).copy()
+
+        self.gravity = param(gravity)
+        self.rope_length = param(rope_length)
+        self.initial_force = param(initial_force)
+        self.force_multiplier = param(force_multiplier)
+
+        # партия
+        self.force = self.initial_force.copy()
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lives = np.full(n, MAX_LIVES, dtype=np.int64)
+        self.screen_y = np.zeros(n, dtype=np.int64)
+        self.gameover = np.zeros(n, dtype=bool)
+        self.camera_descending = np.zeros(n, dtype=bool)
+        self.steps = np.zeros(n, dtype=np.int64)
+
+        # блок
+        self.x = np.full(n, 370.0)
+        self.y = np.full(n, 150.0)
+        self.xlast = np.zeros(n)
+        self.speed = np.zeros(n)
+        self.angle = np.full(n, 45.0)
+        self.block_force = self.force.copy()
+        self.state = np.full(n, READY, dtype=np.int8)
+
+        # башня: из xlist нужны первый (xbase) и последний элементы, число этажей и сумма
+        self.size = np.zeros(n, dtype=np.int64)
+        self.xbase = np.zeros(n)
+        self.top_x = np.zeros(n)
+        self.floors = np.zeros(n, dtype=np.int64)  # len(xlist)
+        self.xsum = np.zeros(n)                    # xsums[-1]
+        # для подстопок: recent_x[:, j] = xlist[-1 - j], recent_sum[:, j] = xsums[-1 - j]
+        self.recent_x = np.zeros((n, TOWER_SUBSTACK_DEPTH + 1))
+        self.recent_sum = np.zeros((n, TOWER_SUBSTACK_DEPTH + 1))
+        self.top_overhang = np.zeros(n)            # get_overhang(), меняется только при постройке
+        self.tower_y = np.full(n, 600.0)
+        self.height = np.zeros(n)
+        self.onscreen = np.zeros(n, dtype=np.int64)
+        self.change = np.zeros(n)
+        self.wobble_speed = np.full(n, 0.4)
+        self.wobbling = np.zeros(n, dtype=bool)
+        self.scrolling = np.zeros(n, dtype=bool)
+        self.golden = np.zeros(n, dtype=bool)
+
+        # политика и статистика
+        self.waited = np.zeros(n, dtype=np.int64)  # шагов на верёвке без броска
+        self.drops = np.zeros(n, dtype=np.int64)
+        self.builds = np.zeros(n, dtype=np.int64)
+        self.goldens = np.zeros(n, dtype=np.int64)
+        self.misses = np.zeros(n, dtype=np.int64)
+        self.max_size = np.zeros(n, dtype=np.int64)
+        # броски и потерянные блоки (промах или падение с башни)
+        # по высоте башни в момент броска
+        self.floor_bins = floor_bins
+        self.floor_drops = np.zeros(floor_bins, dtype=np.int64)
+        self.floor_losses = np.zeros(floor_bins, dtype=np.int64)
+        self.drop_floor = np.zeros(n, dtype=np.int64)  # высота башни при броске
+
+    def new_tower(self, mask):
+        """TowerModel() и BlockModel(force) для партий из mask"""
+        self.size[mask] = 0
+        self.xbase[mask] = 0
+        self.top_x[mask] = 0
+        self.floors[mask] = 0
+        self.xsum[mask] = 0
+        self.recent_x[mask] = 0
+        self.recent_sum[mask] = 0
+        self.top_overhang[mask] = 0
+        self.tower_y[mask] = 600
+        self.height[mask] = 0
+        self.onscreen[mask] = 0
+        self.change[mask] = 0
+        self.wobble_speed[mask] = 0.4
+        self.wobbling[mask] = False
+        self.scrolling[mask] = False
+        self.golden[mask] = False
+
+        self.x[mask] = 370
+        self.y[mask] = 150
+        self.xlast[mask] = 0
+        self.speed[mask] = 0
+        self.angle[mask] = 45
+        self.block_force[mask] = self.force[mask]
+        self.state[mask] = READY
+
+    def collided(self, mask):
+        """BlockModel.collided(): маска попаданий, попутно обновляет golden"""
+        top_center = self.top_x + HALF_WIDTH
+        hit = (
+            mask
+            & (self.size != 0)
+            & (self.xlast < top_center + BLOCK_WIDTH - 4)
+            & (self.xlast > top_center - (BLOCK_WIDTH - 4))
+            & (self.tower_y - self.y <= BLOCK_HEIGHT + 6)
+        )
+        gold = (self.xlast < top_center + 5) & (self.xlast > top_center - 5)
+        self.golden[hit] = gold[hit]
+        return hit
+
+    def fall(self, mask):
+        """Тело BlockModel.drop() для уже отпущенного блока"""
+        self.state[self.collided(mask)] = LANDED
+        bottom = mask & (self.y >= 600 - BLOCK_HEIGHT)
+        self.state[bottom & (self.size == 0)] = LANDED
+        self.state[bottom & (self.size >= 1)] = MISS
+
+        falling = mask & (self.state == DROPPED)
+        self.speed[falling] += self.gravity[falling]
+        self.y[falling] += self.speed[falling]
+
+    def apply_policy(self, delays):
+        """Simulation.drop() для партий, чей блок провисел delays шагов"""
+        if delays.ndim == 1:
+            delay = delays
+        else:
+            delay = delays[np.arange(self.count), self.drops % delays.shape[1]]
+
+        waiting = ~self.gameover & (self.state == READY) & ~self.camera_descending
+        release = waiting & (self.waited >= delay)
+        self.waited[waiting & ~release] += 1
+        self.waited[~waiting] = 0
+        if not release.any():
+            return
+
+        self.waited[release] = 0
+        self.drops[release] += 1
+        self.state[release] = DROPPED
+        self.xlast[release] = self.x[release] + HALF_WIDTH
+        self.drop_floor[release] = np.clip(self.size[release], 0, self.floor_bins - 1)
+        self.count_floors(self.floor_drops, release)
+        self.fall(release)
+
+    def count_floors(self, counter, mask):
+        counter += np.bincount(self.drop_floor[mask], minlength=self.floor_bins)
+
+    def lose_life(self, mask):
+        self.lives[mask] -= 1
+        dead = mask & (self.lives <= 0)
+        self.gameover |= dead
+        self.camera_descending |= mask & ~dead
+
+    def lean(self):
+        """TowerModel.get_lean()"""
+        lean = np.zeros(self.count)
+        m = self.floors >= 2
+        lean[m] = (self.xsum[m] - self.xbase[m]) / (self.floors[m] - 1) - self.xbase[m]
+        return lean
+
+    def overhang(self, mask):
+        """TowerModel.get_overhang() для партий из mask: тот же порядок этажей и то же сравнение"""
+        depth = np.arange(1, TOWER_SUBSTACK_DEPTH + 1)
+        recent_sum = self.recent_sum[mask]
+        offsets = (recent_sum[:, :1] - recent_sum[:, 1:]) / depth - self.recent_x[mask, 1:]
+        offsets[self.floors[mask, None] - 1 < depth] = 0
+        # этажи снизу вверх, при равенстве — нижний (первый в argmax)
+        offsets = offsets[:, ::-1]
+        return offsets[np.arange(len(offsets)), np.abs(offsets).argmax(axis=1)]
+
+    def step(self):
+        """Один Simulation.step() для всех ещё идущих партий"""
+        active = ~self.gameover
+        self.steps[active] += 1
+
+        # спуск камеры после потерянной жизни
+        descending = active & self.camera_descending
+        lowering = descending & (self.screen_y > 0)
+        self.screen_y[lowering] = np.maximum(self.screen_y[lowering] - CAMERA_DESCENT_SPEED, 0)
+        arrived = descending & ~lowering
+        if arrived.any():
+            self.camera_descending[arrived] = False
+            self.new_tower(arrived)
+
+        playing = active & ~descending
+        state = self.state.copy()
+
+        # ready: маятник
+        m = playing & (state == READY)
+        if m.any():
+            angle = self.angle[m]
+            rope = self.rope_length[m]
+            self.x[m] = 370 + rope * np.sin(angle) - HALF_WIDTH
+            self.y[m] = 20 + rope * np.cos(angle)
+            angle = angle + self.speed[m]
+            self.angle[m] = angle
+            self.speed[m] += np.sin(angle) * self.block_force[m]
+
+        # dropped: падение
+        m = playing & (state == DROPPED)
+        if m.any():
+            self.fall(m)
+
+        # landed: постройка этажа и проверка свеса
+        m = playing & (state == LANDED)
+        if m.any():
+            self.state[m] = SCROLL
+            built = (m & (self.size == 0)) | self.collided(m & (self.size != 0))
+            self.size[built] += 1
+            self.onscreen[built] += 1
+            self.top_x[built] = self.xlast[built]
+            first = built & (self.floors == 0)
+            self.xbase[first] = self.xlast[first]
+            self.floors[built] += 1
+            self.xsum[built] += self.xlast[built]
+            self.recent_x[built, 1:] = self.recent_x[built, :-1]
+            self.recent_x[built, 0] = self.xlast[built]
+            self.recent_sum[built, 1:] = self.recent_sum[built, :-1]
+            self.recent_sum[built, 0] = self.xsum[built]
+            self.top_overhang[built] = self.overhang(built)
+            low = built & (self.size <= 5)
+            high = built & ~low
+            self.height[low] = self.size[low] * BLOCK_HEIGHT
+            self.tower_y[low] = 600 - self.height[low]
+            self.height[high] += BLOCK_HEIGHT
+            self.tower_y[high] -= BLOCK_HEIGHT
+
+            gold = built & self.golden
+            self.score[built] += np.where(gold, 2, 1)[built]
+            self.builds[built] += 1
+            self.goldens[gold] += 1
+            np.maximum(self.max_size, self.size, out=self.max_size)
+
+            top_center = self.top_x + HALF_WIDTH
+            overhang = (
+                m
+                & (self.size >= 2)
+                & ((self.xlast > top_center + HALF_WIDTH) | (self.xlast < top_center - HALF_WIDTH))
+            )
+            self.state[overhang] = OVER
+            self.count_floors(self.floor_losses, overhang)
+
+        # over: блок падает с башни
+        m = playing & (state == OVER)
+        if m.any():
+            sink = m & (self.tower_y > self.y)
+            self.y[sink] = self.tower_y[sink]
+            self.size[sink] -= 1
+
+            self.y[m] += 5
+            top_center = self.top_x + HALF_WIDTH
+            offset = BLOCK_WIDTH // 3
+            has_top = m & (self.size >= 1)
+            left = has_top & (self.xlast < top_center + offset)
+            right = has_top & ~left & (self.xlast > top_center - offset)
+            self.x[left] -= 2
+            self.angle[left] += 1
+            self.x[right] += 2
+            self.angle[right] -= 1
+
+        # scroll: башня доехала — следующий блок
+        m = playing & (state == SCROLL) & ~self.scrolling
+        if m.any():
+            self.force[m] *= self.force_multiplier[m]
+            self.angle[m] = np.where(self.size[m] % 2 == 0, -45.0, 45.0)
+            self.speed[m] = 0
+            self.state[m] = READY
+            self.block_force[m] = self.force[m]
+            reset = m & (self.size >= 5) & (self.onscreen >= TOWER_MAX_ONSCREEN)
+            self.onscreen[reset] = TOWER_SCROLLED_FLOORS
+            self.tower_y[reset] = TOWER_SCROLL_LINE
+
+        # miss: мимо башни
+        m = playing & (state == MISS)
+        if m.any():
+            self.misses[m] += 1
+            self.count_floors(self.floor_losses, m)
+            self.tower_y[m] = 2000
+            self.lose_life(m)
+
+        # прокрутка камеры вверх
+        m = playing & (self.height >= BLOCK_HEIGHT * 5) & (self.size >= 5)
+        if m.any():
+            up = m & (self.tower_y <= TOWER_SCROLL_LINE)
+            self.tower_y[up] += SCROLL_SPEED
+            self.scrolling[up] = True
+            done = m & ~up
+            self.height[done] = TOWER_SCROLLED_HEIGHT
+            self.scrolling[done] = False
+            self.onscreen[done] = TOWER_SCROLLED_FLOORS
+            self.screen_y[m] += SCROLL_SPEED
+
+        # раскачивание
+        lean = self.lean()
+        self.wobbling |= playing & (
+            ((np.abs(lean) > TOWER_WOBBLE_LEAN) & (self.size >= 5)) | (self.size >= 20)
+        )
+        m = playing & self.wobbling
+        self.change[m] += self.wobble_speed[m]
+        share = np.minimum(1, np.maximum(np.abs(lean) / TOWER_COLLAPSE_LEAN, TOWER_WOBBLE_MIN_SHARE))
+        amplitude = TOWER_WOBBLE_AMPLITUDE * share
+        self.wobble_speed[playing & (self.change > amplitude)] = -0.4
+        self.wobble_speed[playing & (self.change < -amplitude)] = 0.4
+
+        # check_gameover
+        collapsing = (
+            (np.abs(lean) > TOWER_COLLAPSE_LEAN) | (np.abs(self.top_overhang) > TOWER_SUBSTACK_OVERHANG)
+        )
+        self.tower_y[playing & collapsing] += 5
+
+        toppled = playing & (self.tower_y > 600)
+        self.x[toppled] = 2000
+        self.size[toppled] -= 1
+        fell = playing & ~toppled & (self.state == OVER) & (self.y > 600)
+        self.tower_y[fell] = 2000
+        self.size[fell] -= 1
+        self.lose_life(toppled | fell)
+
+    def run(self, delays, max_steps=100000):
+        """Играть до конца всех партий (или max_steps шагов). Возвращает self."""
+        delays = np.asarray(delays, dtype=np.int64)
+        if delays.ndim == 1:
+            delays = np.broadcast_to(delays, (self.count,))
+        for _ in range(max_steps):
+            if self.gameover.all():
+                break
+            self.apply_policy(delays)
+            self.step()
+        return self
+
+    def results(self):
+        """Итоги по партиям — словарь массивов"""
+        return {
+            "score": self.score.copy(),
+            "lives": self.lives.copy(),
+            "steps": self.steps.copy(),
+            "gameover": self.gameover.copy(),
+            "max_size": self.max_size.copy(),
+            "builds": self.builds.copy(),
+            "goldens": self.goldens.copy(),
+            "misses": self.misses.copy(),
+            "drops": self.drops.copy(),
+        }
+
+
+def play_scalar(delays, max_steps=100000):
+    """
+    Та же политика на обычной Simulation (одна партия).
+    delays — задержка или список задержек по броскам. Возвращает (score, lives, steps).
+    """
+    if np.ndim(delays) == 0:
+        delays = [int(delays)]
+    delays = [int(delay) for delay in delays]
+
+    sim = Simulation()
+    waited = 0
+    drops = 0
+    steps = 0
+    while not sim.gameover and steps < max_steps:
+        if sim.block.state == "ready" and not sim.camera_descending:
+            if waited >= delays[drops % len(delays)]:
+                sim.drop()
+                waited = 0
+                drops += 1
+            else:
+                waited += 1
+        else:
+            waited = 0
+        sim.step()
+        steps += 1
+    return sim.score, sim.lives, steps
@@ -0,0 +1,45 @@
+"""
+Камера: сдвиг по вертикали, его сглаживание между шагами и видимая область.
+
+Сдвиг (sim.screenY) и спуск после промаха — правила, они в Simulation;
+камера только читает их. Координаты башни и блока в симуляции уже
+экранные (башня съезжает вниз вместе с прокруткой), в мировых координатах
+живёт фон: экранный y = мировой y + сдвиг камеры.
+"""
+import pygame
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, INTERPOLATION_SNAP
+
+
+class Camera:
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.viewport = pygame.Rect(0, 0, width, height)
+        self.reset()
+
+    def reset(self):
+        self.y = 0           # сдвиг после последнего шага симуляции
+        self.prev_y = 0      # сдвиг перед ним
+        self.render_y = 0    # сдвиг для отрисовки (интерполированный)
+        self.descending = False
+
+    def remember(self, sim):
+        """Запомнить сдвиг перед шагом симуляции"""
+        self.prev_y = self.y = sim.screenY
+
+    def follow(self, sim):
+        """Взять сдвиг и спуск камеры из симуляции после шага"""
+        self.y = sim.screenY
+        self.descending = sim.camera_descending
+
+    def interpolate(self, alpha):
+        """Сдвиг для отрисовки между прошлым и текущим шагом (alpha 0..1)"""
+        if alpha >= 1 or abs(self.y - self.prev_y) >= INTERPOLATION_SNAP:
+            self.render_y = self.y
+        else:
+            self.render_y = round(self.prev_y + (self.y - self.prev_y) * alpha)
+
+    def is_visible(self, rect):
+        return self.viewport.colliderect(rect)
+
+    def clip(self, rect):
+        """Видимая часть прямоугольника (пустой Rect, если не видно ничего)"""
+        return self.viewport.clip(rect)
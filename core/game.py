@@ -1,24 +1,46 @@
 """Основной игровой класс с магазином и настройками"""
 import pygame
+import os
+import time
 from config import *
 from entities.block import Block
 from entities.tower import Tower
 from ui.hud import HUD
+from ui.background import Background
 from ui.gameover_screen import GameOverScreen
 from ui.shop_menu import ShopMenu
 from ui.settings_menu import SettingsMenu
 from ui.button import Button
+from core.renderer import DirtyRenderer
+from core.camera import Camera
+from core.simulation import Simulation
+from core.input_script import InputScript, InputRecorder
 from managers.resource_manager import ResourceManager
 from managers.audio_manager import AudioManager
 from managers.save_manager import SaveManager
+from managers.persistence import PersistenceWorker
+from managers.run_history import RunHistory
+from managers.font_manager import fonts
 
 
 
 class Game:
-    def __init__(self):
-        self.save_manager = SaveManager()
+    def __init__(self, headless=False, record_path=None):
+        # headless: без окна и звука (драйверы SDL dummy), без записи сохранений
+        self.headless = headless
+        # номер кадра симуляции (вызова update) — к нему привязана запись ввода
+        self.frame = 0
+        self.recorder = InputRecorder(record_path) if record_path else None
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+        # вся запись на диск — в фоновом потоке, кадр её не ждёт
+        self.persistence = PersistenceWorker()
+        self.save_manager = SaveManager(read_only=headless, worker=self.persistence)
+        self.run_history = RunHistory(read_only=headless, worker=self.persistence)
         self.resource_manager = ResourceManager()
-        self.audio_manager = AudioManager(self.resource_manager)
+        self.audio_manager = AudioManager(self.resource_manager, enabled=not headless)
         
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -28,11 +50,12 @@ class Game:
         self.load_resources()
 
 
-        self.hud = HUD(pygame.font.Font("freesansbold.ttf", 32))
+        self.background = Background(self.resource_manager, self.save_manager)
+        self.hud = HUD(fonts.get_font(32))
         self.gameover_screen = GameOverScreen(
-            pygame.font.Font("freesansbold.ttf", 64),
-            pygame.font.Font("freesansbold.ttf", 32),
-            pygame.font.Font("freesansbold.ttf", 16),
+            fonts.get_font(64),
+            fonts.get_font(32),
+            fonts.get_font(16),
             self.create_fallback_background(),
         )
         self.shop_menu = ShopMenu(self.save_manager, self.resource_manager)
@@ -41,20 +64,24 @@ class Game:
 
         self.shop_button = Button(
             650, 10, 130, 40, "Shop",
-            pygame.font.Font("freesansbold.ttf", 20),
+            fonts.get_font(20),
             color=(100, 100, 200), hover_color=(150, 150, 255),
         )
         self.settings_button = Button(
             500, 10, 130, 40, "Settings",
-            pygame.font.Font("freesansbold.ttf", 20),
+            fonts.get_font(20),
             color=(120, 80, 200), hover_color=(180, 120, 255),
         )
 
 
         self.shop_open = False
         self.settings_open = False
-        self.force = INITIAL_FORCE
-        self.camera_descending = False
+        # затемнённый снимок игры под открытым меню и меню, для которого он снят
+        self.menu_backdrop = None
+        self.menu_backdrop_owner = None
+        # правила и состояние партии; Game только рисует их и играет звуки
+        self.sim = Simulation()
+        self.camera = Camera()
         self.reset_game()
 
 
@@ -63,6 +90,11 @@ class Game:
         self.clock = pygame.time.Clock()
 
 
+        # опциональный режим: на дисплей уходят только изменившиеся области
+        self.dirty_rendering = DIRTY_RECT_RENDERING
+        self.renderer = DirtyRenderer(self.screen)
+
+
     def create_fallback_background(self):
         bg = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         bg.fill((135, 206, 235))
@@ -83,8 +115,7 @@ class Game:
 
 
         print("\n=== Loading tower skins ===")
-        for skin_id in TOWER_SKINS.keys():
-            self.resource_manager.load_tower_parts(skin_id)
+        self.resource_manager.load_tower_skins(list(TOWER_SKINS.keys()))
         print("=== Tower skins loaded ===\n")
 
 
@@ -93,22 +124,24 @@ class Game:
 
 
     def reset_game(self):
+        self.sim.reset()
+        self.new_round()
+
+
+        self.camera.reset()
+        self.alpha = 1.0  # доля шага симуляции, прошедшая к моменту отрисовки
+
+
+    def new_round(self):
+        """Спрайты для свежих башни и блока симуляции"""
         selected_skin = self.save_manager.get_selected_skin()
-        self.tower = Tower(self.resource_manager, selected_skin)
+        self.tower = Tower(self.sim.tower, self.resource_manager, selected_skin)
         
         # ПОЛНЫЙ СБРОС очереди: следующий блок будет bot
         self.resource_manager.reset_block_cycle(selected_skin)
         
         block_sprite = self.resource_manager.get_next_block_sprite(selected_skin)
-        self.block = Block(block_sprite, self.force)
-
-
-        self.score = 0
-        self.lives = MAX_LIVES
-        self.screenY = 0
-        self.force = INITIAL_FORCE
-        self.gameover = False
-        self.camera_descending = False
+        self.block = Block(self.sim.block, block_sprite, self.resource_manager)
 
 
     def handle_events(self):
@@ -126,251 +159,355 @@ class Game:
             if self.settings_open:
                 result = self.settings_menu.handle_event(event, mouse_pos)
                 if result == "close":
-                    self.settings_open = False
+                    self.apply_action("close")
+                elif result == "background_changed":
+                    self.record("background", self.save_manager.get_selected_background())
+                    self.menu_backdrop = None
 
 
             elif self.shop_open:
                 result = self.shop_menu.handle_event(event, mouse_pos)
                 if result == "close":
-                    self.shop_open = False
+                    self.apply_action("close")
                 elif result in ("skin_selected", "skin_purchased"):
-                    selected_skin = self.save_manager.get_selected_skin()
-                    self.tower.change_skin(selected_skin)
-                    next_sprite = self.resource_manager.get_next_block_sprite(selected_skin)
-                    if next_sprite:
-                        self.block.image = next_sprite
-                        self.block.rotimg = next_sprite
+                    self.record("skin", self.save_manager.get_selected_skin())
+                    self.apply_skin()
             else:
                 self.shop_button.update(mouse_pos)
                 self.settings_button.update(mouse_pos)
 
 
                 if self.shop_button.is_clicked(event):
-                    self.shop_open = True
+                    self.apply_action("shop")
                 if self.settings_button.is_clicked(event):
-                    self.settings_open = True
+                    self.apply_action("settings")
 
 
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_SPACE:
-                        if self.block.get_state() == "ready" and not self.camera_descending:
-                            self.block.drop(self.tower)
+                        self.apply_action("drop")
 
 
         return True
 
 
+    def apply_skin(self):
+        """Скин сменился в магазине — перерисовать башню и блок на верёвке"""
+        self.menu_backdrop = None
+        selected_skin = self.save_manager.get_selected_skin()
+        self.tower.change_skin(selected_skin)
+        next_sprite = self.resource_manager.get_next_block_sprite(selected_skin)
+        if next_sprite:
+            self.block.set_image(next_sprite)
+
+
+    def record(self, action, arg=None):
+        """Записать действие игрока с кадром, перед которым оно применено"""
+        if self.recorder:
+            self.recorder.record(self.frame, action, arg)
+
+
+    def save_recording(self):
+        if self.recorder:
+            self.recorder.save(self.frame)
+            print(f"Replay saved: {self.recorder.path} ({len(self.recorder.actions)} actions)")
+
+
+    def close_storage(self):
+        """Выход: сбросить изменения и дождаться, пока фоновый поток всё запишет"""
+        self.save_manager.flush()
+        self.run_history.close()
+        self.persistence.close()
+        stats = self.save_manager.get_stats()
+        print(f"Save: {stats['writes']} writes, {stats['writes_avoided']} avoided")
+        stats = self.run_history.get_stats()
+        print(f"Run history: {stats['recorded']} runs in {stats['batches']} batches")
+        stats = self.persistence.get_stats()
+        print(f"Persistence: {stats['jobs']} jobs, {stats['busy_time'] * 1000:.1f} ms off the main thread, "
+              f"slowest {stats['max_job_time'] * 1000:.1f} ms")
+
+
+    def finish_game(self):
+        """Game Over: рекорд, история партий и отметка в записи; возвращает очки партии"""
+        score = self.sim.score
+        self.record("gameover", score)
+        self.save_manager.update_high_score(score)
+        self.run_history.record(
+            score, self.sim.builds, self.sim.goldens, self.sim.misses,
+            self.sim.frame / SIMULATION_RATE, self.save_manager.get_selected_skin(),
+        )
+        self.save_manager.flush()
+        return score
+
+
+    def apply_action(self, action, arg=None):
+        """Действие игрока — с клавиатуры, из сценария или записи; попадает в запись"""
+        if action in ("gameover", "end"):
+            return  # служебные записи, на игру не влияют
+        self.record(action, arg)
+
+        if action == "drop":
+            if not self.shop_open and not self.settings_open:
+                self.sim.drop()
+        elif action == "shop":
+            self.shop_open = True
+        elif action == "settings":
+            self.settings_open = True
+        elif action == "close":
+            self.shop_open = False
+            self.settings_open = False
+            self.save_manager.flush()
+        elif action == "skin":
+            if self.shop_menu.handle_skin_click(arg) in ("skin_selected", "skin_purchased"):
+                self.apply_skin()
+        elif action == "background":
+            self.save_manager.set_selected_background(arg)
+            self.menu_backdrop = None
+
+
     def update(self):
+        self.frame += 1
         if self.shop_open or self.settings_open:
             return
 
 
-        if self.camera_descending:
-            if self.screenY > 0:
-                self.screenY -= 10
-                if self.screenY < 0:
-                    self.screenY = 0
-            else:
-                self.camera_descending = False
-                selected_skin = self.save_manager.get_selected_skin()
-                self.tower = Tower(self.resource_manager, selected_skin)
-                
-                # СБРОС очереди после промаха
-                self.resource_manager.reset_block_cycle(selected_skin)
-                
-                block_sprite = self.resource_manager.get_next_block_sprite(selected_skin)
-                self.block = Block(block_sprite, self.force)
-            return
+        for event, value in self.sim.step():
+            self.apply_event(event, value)
 
 
-        state = self.block.get_state()
-
-
-        if state == "ready":
-            self.block.swing()
-        elif state == "dropped":
-            self.block.drop(self.tower)
-        elif state == "landed":
-            if self.block.to_build(self.tower):
-                self.tower.build(self.block.xlast, self.block.image)
-
-
-                if self.tower.is_golden():
-                    self.audio_manager.play_sound("gold")
-                    self.score += 2
-                    self.save_manager.add_coins(2)
-                else:
-                    self.audio_manager.play_sound("build")
-                    self.score += 1
-                    self.save_manager.add_coins(1)
-
-
-                # следующий блок из очереди
-                skin_id = self.save_manager.get_selected_skin()
-                next_sprite = self.resource_manager.get_next_block_sprite(skin_id)
-                self.block.image = next_sprite
-                self.block.rotimg = next_sprite
-
-
-            if self.tower.size >= 2:
-                self.block.collapse(self.tower)
-        elif state == "over":
-            self.tower.unbuild(self.block)
-            self.block.to_fall(self.tower)
-            if not hasattr(self, "_fall_sound_played"):
-                self._fall_sound_played = True
-                self.audio_manager.play_sound("fall")
-                self.audio_manager.play_sound("overmusic")
-        elif state == "scroll" and not self.tower.is_scrolling():
-            self.force *= FORCE_MULTIPLIER
-            self.block.respawn(self.tower, self.force)
-            if self.tower.size >= 5:
-                self.tower.reset()
-            if hasattr(self, "_fall_sound_played"):
-                del self._fall_sound_played
-        elif state == "miss":
-            if not hasattr(self, "_miss_sound_played"):
-                self._miss_sound_played = True
-                self.audio_manager.play_sound("overmusic")
-            
+    def apply_event(self, event, value):
+        """Реакция на события шага симуляции: спрайты, звуки, монеты"""
+        if event == "build":
+            self.tower.add_floor(value, self.block.image)
+        elif event == "sound":
+            self.audio_manager.play_sound(value)
+        elif event == "coins":
+            self.save_manager.add_coins(value)
+        elif event == "next_block":
+            # следующий блок из очереди
+            skin_id = self.save_manager.get_selected_skin()
+            self.block.set_image(self.resource_manager.get_next_block_sprite(skin_id))
+        elif event == "miss":
             # СБРОС очереди при промахе
             selected_skin = self.save_manager.get_selected_skin()
             self.resource_manager.reset_block_cycle(selected_skin)
-            
-            self.tower.y = 2000
-            self.lives -= 1
-            if self.lives <= 0:
-                self.gameover = True
-            else:
-                self.camera_descending = True
-            if hasattr(self, "_miss_sound_played"):
-                del self._miss_sound_played
-
-
-        if self.tower.height >= BLOCK_HEIGHT * 5 and self.tower.size >= 5:
-            self.tower.scroll()
-            self.screenY += SCROLL_SPEED
-
-
-        self.tower.wobble()
-        self.check_gameover()
-
-
-    def check_gameover(self):
-        if self.tower.get_width() < -140:
-            self.tower.collapse("l")
-            if not hasattr(self, "_collapse_sound_played"):
-                self._collapse_sound_played = True
-                self.audio_manager.play_sound("overmusic")
-        elif self.tower.get_width() > 140:
-            self.tower.collapse("r")
-            if not hasattr(self, "_collapse_sound_played"):
-                self._collapse_sound_played = True
-                self.audio_manager.play_sound("overmusic")
-
-
-        if self.tower.y > 600:
-            self.block.x = 2000
-            self.tower.size -= 1
-            self.lives -= 1
-            if self.lives <= 0:
-                self.gameover = True
-            else:
-                self.camera_descending = True
-            if hasattr(self, "_collapse_sound_played"):
-                del self._collapse_sound_played
-
-
-        elif self.block.get_state() == "over" and self.block.y > 600:
-            self.tower.y = 2000
-            self.tower.size -= 1
-            self.lives -= 1
-            if self.lives <= 0:
-                self.gameover = True
-            else:
-                self.camera_descending = True
-            if hasattr(self, "_fall_sound_played"):
-                del self._fall_sound_played
-
-
-    def draw(self):
-        selected_bg = self.save_manager.get_selected_background()
-        bg_image = self.resource_manager.get_image(f"bg{selected_bg + 1}")
+        elif event == "round":
+            # камера спустилась после промаха — новая башня и новая очередь
+            self.new_round()
 
 
-        if bg_image:
-            bg_width = bg_image.get_width()
-            bg_height = bg_image.get_height()
-
-
-            clouds_height = int(bg_height * 0.08)
-            clouds_part = pygame.Surface((bg_width, clouds_height), pygame.SRCALPHA)
-            clouds_part.blit(bg_image, (0, 0), (0, 0, bg_width, clouds_height))
-
-
-            main_part_height = bg_height - clouds_height
-            main_part = pygame.Surface((bg_width, main_part_height), pygame.SRCALPHA)
-            main_part.blit(
-                bg_image, (0, 0), (0, clouds_height, bg_width, main_part_height)
-            )
-
+    def get_open_menu(self):
+        if self.settings_open:
+            return self.settings_menu
+        if self.shop_open:
+            return self.shop_menu
+        return None
 
-            main_bg_y = self.screenY
-            y_pos = main_bg_y
-            while y_pos < SCREEN_HEIGHT:
-                self.screen.blit(main_part, (0, y_pos))
-                y_pos += main_part_height
 
+    def draw_scene(self):
+        menu = self.get_open_menu()
+        if menu is None:
+            self.menu_backdrop = None
+            self.draw_game()
+            self.shop_button.draw(self.screen)
+            self.settings_button.draw(self.screen)
+            return
 
-            if main_bg_y > 0:
-                y_pos = main_bg_y - clouds_height
-                while y_pos >= -clouds_height:
-                    self.screen.blit(clouds_part, (0, y_pos))
-                    y_pos -= clouds_height
+        # игра под меню стоит на месте: снимаем и затемняем её один раз
+        if self.menu_backdrop is None or self.menu_backdrop_owner is not menu:
+            self.draw_game()
+            self.menu_backdrop = self.screen.copy()
+            self.menu_backdrop_owner = menu
+            menu.darken(self.menu_backdrop)
+
+        self.screen.blit(self.menu_backdrop, (0, 0))
+        menu.draw(self.screen)
+
+
+    def draw_game(self):
+        camera = self.camera
+        self.background.draw(self.screen, camera)
+
+
+        if self.sim.tower.display_status and not camera.descending:
+            self.tower.display(self.screen, camera)
+        if not camera.descending:
+            self.block.display(self.screen, self.tower, camera)
+
+
+        self.hud.draw(self.screen, self.sim.score, self.save_manager.get_coins(), self.sim.lives)
+
+
+    def get_render_layers(self):
+        """Слои для DirtyRenderer: (имя, ключ состояния, прямоугольник на экране)"""
+        layers = []
+
+        sim = self.sim
+        camera = self.camera
+        # ключ — по полному прямоугольнику: обрезанный по экрану не меняется,
+        # когда холст башни сдвигается на пиксель за краем экрана
+        tower_key = tower_rect = None
+        if sim.tower.display_status and not camera.descending:
+            tower_key = self.tower.get_dirty_rect()
+            tower_rect = camera.clip(tower_key)
+        layers.append((
+            "tower",
+            (tuple(tower_key) if tower_key else None, self.tower.floor_count(), self.tower.canvas_count),
+            tower_rect,
+        ))
+
+        block_key = block_rect = None
+        if not camera.descending and not sim.tower.scrolling:
+            block_key = self.block.get_dirty_rect()
+            block_rect = camera.clip(block_key)
+        layers.append((
+            "block",
+            (
+                tuple(block_key) if block_key else None,
+                self.block.render_x, self.block.render_y, sim.block.state, id(self.block.rotimg),
+            ),
+            block_rect,
+        ))
+
+        coins = self.save_manager.get_coins()
+        layers.append((
+            "hud",
+            (sim.score, coins, sim.lives),
+            self.hud.get_rect(sim.score, coins, sim.lives),
+        ))
+
+        menu = self.get_open_menu()
+        if menu is None:
+            for name, button in (("shop_button", self.shop_button),
+                                 ("settings_button", self.settings_button)):
+                layers.append((name, button.is_hovered, button.rect.inflate(2, 2)))
         else:
-            self.screen.fill((135, 206, 235))
-
-
-        if self.tower.get_display() and not self.camera_descending:
-            self.tower.display(self.screen)
-        if not self.camera_descending:
-            self.block.display(self.screen, self.tower)
+            layers.extend(menu.get_render_layers())
 
+        return layers
 
-        self.hud.show_score(self.screen, self.score)
-        self.hud.show_coins(self.screen, self.save_manager.get_coins())
-        self.hud.show_lives(self.screen, self.lives)
 
+    def remember_positions(self):
+        """Снимок позиций перед шагом симуляции — для интерполяции"""
+        self.camera.remember(self.sim)
+        self.block.remember()
+        self.tower.remember()
 
-        if not self.shop_open and not self.settings_open:
-            self.shop_button.draw(self.screen)
-            self.settings_button.draw(self.screen)
 
+    def interpolate_positions(self):
+        alpha = self.alpha
+        self.camera.follow(self.sim)
+        self.camera.interpolate(alpha)
+        self.block.interpolate(alpha)
+        self.tower.interpolate(alpha)
 
-        if self.shop_open:
-            self.shop_menu.draw(self.screen)
-        if self.settings_open:
-            self.settings_menu.draw(self.screen)
 
+    def draw(self):
+        self.interpolate_positions()
+        if self.headless:
+            self.draw_scene()
+            return
+        if not self.dirty_rendering:
+            self.draw_scene()
+            pygame.display.update()
+            return
 
-        pygame.display.update()
+        view = (
+            self.camera.render_y,
+            self.save_manager.get_selected_background(),
+            self.shop_open,
+            self.settings_open,
+        )
+        # меню открылось (смена view) или его подложку надо снять заново — кадр
+        # целиком; дальше открытое меню — обычные слои. Пока камера едет — тоже целиком
+        menu = self.get_open_menu()
+        rebuild_backdrop = menu is not None and (
+            self.menu_backdrop is None or self.menu_backdrop_owner is not menu
+        )
+        full = rebuild_backdrop or self.sim.camera_descending
+        self.renderer.present(self.draw_scene, self.get_render_layers(), view, full)
 
 
     def run(self):
+        """
+        Физика идёт фиксированными шагами 1/SIMULATION_RATE независимо от FPS:
+        накопленное время расходуется целыми шагами, остаток идёт в интерполяцию.
+        """
+        step = 1.0 / SIMULATION_RATE
+        accumulator = 0.0
+        previous = time.perf_counter()
         running = True
         while running:
             self.clock.tick(FPS)
+            self.save_manager.tick()
+            self.run_history.tick()
 
 
-            if self.gameover and not self.shop_open and not self.settings_open:
-                self.save_manager.update_high_score(self.score)
-                self.gameover_screen.show(self.screen, self.score)
+            if self.sim.gameover and not self.shop_open and not self.settings_open:
+                self.finish_game()
+                self.gameover_screen.show(self.screen, self.sim.score)
                 self.reset_game()
+                self.renderer.invalidate()
+                previous = time.perf_counter()
+                accumulator = 0.0
+
+
+            now = time.perf_counter()
+            accumulator += min(now - previous, MAX_FRAME_TIME)
+            previous = now
 
 
             running = self.handle_events()
-            self.update()
+            while accumulator >= step and not self.sim.gameover:
+                self.remember_positions()
+                self.update()
+                accumulator -= step
+            self.alpha = accumulator / step
             self.draw()
 
 
+        stats = fonts.get_stats()
+        print(f"Text cache: {stats['hits']} hits, {stats['misses']} misses")
+        self.close_storage()
+        self.save_recording()
+        pygame.quit()
+
+
+    def run_headless(self, script=None, frames=3600, render=True):
+        """
+        Прогон без ограничения FPS: один шаг симуляции на кадр, ввод — из
+        сценария или записи, Game Over сразу начинает новую партию.
+        Возвращает отчёт с FPS и очками законченных партий.
+        """
+        script = script or InputScript()
+        scores = []
+        start = time.perf_counter()
+        for _ in range(frames):
+            if self.sim.gameover:
+                scores.append(self.finish_game())
+                self.reset_game()
+
+            for action, arg in script.poll(self.frame):
+                self.apply_action(action, arg)
+            self.remember_positions()
+            self.update()
+            if render:
+                self.draw()
+        elapsed = time.perf_counter() - start
+
+        report = {
+            "frames": frames,
+            "seconds": elapsed,
+            "fps": frames / elapsed if elapsed > 0 else float("inf"),
+            "games": len(scores),
+            "scores": scores,
+            "best_score": max(scores + [self.sim.score]),
+        }
+        print(
+            f"Headless: {frames} frames in {elapsed:.2f}s = {report['fps']:.0f} FPS, "
+            f"games over: {report['games']}, best score: {report['best_score']}"
+        )
+        self.close_storage()
+        self.save_recording()
         pygame.quit()
+        return report
@@ -0,0 +1,90 @@
+"""Сценарий ввода: действия игрока, привязанные к номерам кадров симуляции.
+
+Запись (InputRecorder) и воспроизведение (InputScript) используют один
+формат JSONL: {"frame": 120, "action": "drop"} на строку, "arg" — если есть.
+Служебные записи: "gameover" (arg — очки партии) и "end" — сколько кадров
+длилась сессия; в "end" же лежит "rules" — версия правил, по которым шла
+игра (в записях старше её нет, такие файлы по нынешним правилам не проверить).
+"""
+import json
+from core.simulation import RULES_VERSION
+
+
+class InputScript:
+    """
+    Действия — кортежи (кадр, действие, аргумент), например (120, "drop", None).
+    Файл сценария — JSONL: {"frame": 120, "action": "drop"} на строку.
+    """
+
+    def __init__(self, actions=(), rules=None):
+        self.actions = sorted(actions, key=lambda item: item[0])
+        self.position = 0
+        self.rules = rules  # версия правил записи, None — записано до версий
+
+    @classmethod
+    def load(cls, path):
+        actions = []
+        rules = None
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+                actions.append((item["frame"], item["action"], item.get("arg")))
+                if item["action"] == "end":
+                    rules = item.get("rules")
+        return cls(actions, rules)
+
+    @classmethod
+    def drop_every(cls, interval, frames):
+        """Простейший автопилот: отпускать блок каждые interval кадров"""
+        return cls((frame, "drop", None) for frame in range(interval, frames, interval))
+
+    def compatible(self):
+        """Записано по нынешним правилам — можно проигрывать и сверять очки"""
+        return self.rules == RULES_VERSION
+
+    def poll(self, frame):
+        """Действия, назначенные на кадры до frame включительно"""
+        due = []
+        while self.position < len(self.actions) and self.actions[self.position][0] <= frame:
+            _, action, arg = self.actions[self.position]
+            due.append((action, arg))
+            self.position += 1
+        return due
+
+    def finished(self):
+        return self.position >= len(self.actions)
+
+    def end_frame(self):
+        """Длина записанной сессии в кадрах (по записи "end" или последнему действию)"""
+        for frame, action, _ in reversed(self.actions):
+            if action == "end":
+                return frame
+        return self.actions[-1][0] + 1 if self.actions else 0
+
+    def scores(self):
+        """Очки партий, записанные при Game Over"""
+        return [arg for _, action, arg in self.actions if action == "gameover"]
+
+
+class InputRecorder:
+    """Копит действия игрока с номером кадра и пишет их в JSONL"""
+
+    def __init__(self, path):
+        self.path = path
+        self.actions = []
+
+    def record(self, frame, action, arg=None):
+        self.actions.append((frame, action, arg))
+
+    def save(self, end_frame):
+        with open(self.path, "w") as f:
+            for frame, action, arg in self.actions:
+                item = {"frame": frame, "action": action}
+                if arg is not None:
+                    item["arg"] = arg
+                f.write(json.dumps(item, separators=(",", ":")) + "\n")
+            end = {"frame": end_frame, "action": "end", "rules": RULES_VERSION}
+            f.write(json.dumps(end, separators=(",", ":")) + "\n")
@@ -0,0 +1,78 @@
+"""Отрисовка «грязными» прямоугольниками: на дисплей уходят только изменившиеся области"""
+import pygame
+
+
+class DirtyRenderer:
+    def __init__(self, screen):
+        self.screen = screen
+        self.layers = {}      # имя слоя -> (ключ состояния, прямоугольник)
+        self.view = None      # сдвиг камеры, фон и открытые меню прошлого кадра
+        self.full_redraw = True
+        self.full_frames = 0
+        self.dirty_frames = 0
+
+    def invalidate(self):
+        """Следующий кадр перерисовать целиком (например, после экрана Game Over)"""
+        self.full_redraw = True
+
+    def collect_dirty(self, layers):
+        """Старые и новые прямоугольники слоёв, чьё состояние изменилось"""
+        dirty = []
+        current = {}
+        for name, key, rect in layers:
+            current[name] = (key, rect)
+            old = self.layers.get(name)
+            if old is not None and old[0] == key:
+                continue
+            if old is not None and old[1]:
+                dirty.append(old[1])
+            if rect:
+                dirty.append(rect)
+        for name, (key, rect) in self.layers.items():
+            if name not in current and rect:
+                dirty.append(rect)
+        self.layers = current
+        return self.merge(dirty)
+
+    def merge(self, rects):
+        """Склеить пересекающиеся прямоугольники, обрезав их по экрану"""
+        bounds = self.screen.get_rect()
+        merged = []
+        for rect in rects:
+            rect = rect.clip(bounds)
+            if not rect.width or not rect.height:
+                continue
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def present(self, draw_scene, layers, view, full=False):
+        """
+        draw_scene рисует весь кадр; layers — список (имя, ключ, прямоугольник),
+        view — всё, при смене чего нужен полный кадр (камера, фон, меню).
+        """
+        if view != self.view:
+            self.view = view
+            full = True
+
+        if full or self.full_redraw:
+            self.full_redraw = False
+            self.collect_dirty(layers)
+            draw_scene()
+            pygame.display.update()
+            self.full_frames += 1
+            return
+
+        dirty = self.collect_dirty(layers)
+        if not dirty:
+            return
+
+        for rect in dirty:
+            self.screen.set_clip(rect)
+            draw_scene()
+        self.screen.set_clip(None)
+        pygame.display.update(dirty)
+        self.dirty_frames += 1
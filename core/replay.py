@@ -0,0 +1,41 @@
+"""
+Повтор записи ввода на чистой симуляции — без pygame, окна и спрайтов.
+
+Кадры идут так же, как в Game.run_headless(): в начале кадра законченная
+партия сбрасывается, затем применяются действия кадра, затем шаг симуляции
+(если не открыто меню). Скины, фоны и громкость на правила не влияют.
+"""
+from core.simulation import Simulation
+
+
+def replay_gameovers(script, frames=None):
+    """Проиграть запись; [(кадр, очки)] для каждого Game Over"""
+    if frames is None:
+        frames = script.end_frame()
+    sim = Simulation()
+    shop_open = settings_open = False
+    gameovers = []
+    for frame in range(frames):
+        if sim.gameover:
+            gameovers.append((frame, sim.score))
+            sim.reset()
+
+        for action, _ in script.poll(frame):
+            if action == "drop":
+                if not shop_open and not settings_open:
+                    sim.drop()
+            elif action == "shop":
+                shop_open = True
+            elif action == "settings":
+                settings_open = True
+            elif action == "close":
+                shop_open = settings_open = False
+
+        if not shop_open and not settings_open:
+            sim.step()
+    return gameovers
+
+
+def recorded_gameovers(script):
+    """[(кадр, очки)] из записей "gameover" — то, что заявил игрок"""
+    return [(frame, arg) for frame, action, arg in script.actions if action == "gameover"]
@@ -0,0 +1,638 @@
+"""
+Правила игры без pygame: маятник, падение, приземление, обрушение, очки и жизни.
+
+Block/Tower из entities и Game только рисуют это состояние и реагируют
+на события шага (звуки, монеты, смена спрайтов), поэтому симуляцию можно
+гонять без окна и спрайтов.
+"""
+from array import array
+from collections import OrderedDict
+from math import sin, cos
+from config import (
+    GRAVITY,
+    ROPE_LENGTH,
+    BLOCK_HEIGHT,
+    BLOCK_WIDTH,
+    SCROLL_SPEED,
+    MAX_LIVES,
+    INITIAL_FORCE,
+    FORCE_MULTIPLIER,
+    TRAJECTORY_CHUNK,
+    TRAJECTORY_MAX_STEPS,
+    TRAJECTORY_CACHE_SIZE,
+    TOWER_WOBBLE_LEAN,
+    TOWER_COLLAPSE_LEAN,
+    TOWER_SUBSTACK_DEPTH,
+    TOWER_SUBSTACK_OVERHANG,
+    TOWER_WOBBLE_AMPLITUDE,
+    TOWER_WOBBLE_MIN_SHARE,
+    TOWER_SCROLL_LINE,
+    TOWER_SCROLLED_HEIGHT,
+    TOWER_SCROLLED_FLOORS,
+    TOWER_MAX_ONSCREEN,
+    CAMERA_DESCENT_SPEED,
+)
+
+# версия правил: поднимается при любом изменении, от которого зависит исход
+# партии; записи ввода других версий проверять нельзя (core.input_script)
+RULES_VERSION = 2
+
+
+class SwingTrajectory:
+    """
+    Таблица маятника для пары (сила, стартовый угол) при нулевой начальной
+    скорости: тот же пошаговый расчёт, что был в swing(), но посчитанный один
+    раз. Индекс k — номер шага (фаза) с момента респауна.
+
+    xs[k], ys[k] — позиция блока после k-го шага; angles[k], speeds[k],
+    accelerations[k] — состояние маятника перед ним.
+    """
+
+    __slots__ = ("force", "start_angle", "xs", "ys", "angles", "speeds", "accelerations", "_period")
+
+    def __init__(self, force, start_angle):
+        self.force = force
+        self.start_angle = start_angle
+        self.xs = []
+        self.ys = []
+        self.angles = [start_angle]
+        self.speeds = [0]
+        self.accelerations = [0]
+        self._period = None
+        self.extend(TRAJECTORY_CHUNK)
+
+    def extend(self, steps):
+        """Досчитать ещё steps шагов"""
+        force = self.force
+        angle = self.angles[-1]
+        speed = self.speeds[-1]
+        for _ in range(steps):
+            self.xs.append(370 + ROPE_LENGTH * sin(angle) - BLOCK_WIDTH // 2)
+            self.ys.append(20 + ROPE_LENGTH * cos(angle))
+            angle += speed
+            acceleration = sin(angle) * force
+            speed += acceleration
+            self.angles.append(angle)
+            self.speeds.append(speed)
+            self.accelerations.append(acceleration)
+
+    def position(self, phase):
+        """Где будет блок после шага номер phase"""
+        if phase >= TRAJECTORY_MAX_STEPS:
+            # дальше таблица не растёт (как и в swing) — досчитываем без записи
+            self.position(TRAJECTORY_MAX_STEPS - 1)
+            angle = self.angles[TRAJECTORY_MAX_STEPS]
+            speed = self.speeds[TRAJECTORY_MAX_STEPS]
+            for _ in range(phase - TRAJECTORY_MAX_STEPS + 1):
+                x = 370 + ROPE_LENGTH * sin(angle) - BLOCK_WIDTH // 2
+                y = 20 + ROPE_LENGTH * cos(angle)
+                angle += speed
+                speed += sin(angle) * self.force
+            return x, y
+        while phase >= len(self.xs):
+            self.extend(TRAJECTORY_CHUNK)
+        return self.xs[phase], self.ys[phase]
+
+    def path(self, start=0, count=None):
+        """Позиции [(x, y)] шагов start..start+count (по умолчанию — один период)"""
+        if count is None:
+            count = self.period
+        self.position(start + count - 1)
+        return list(zip(self.xs[start:start + count], self.ys[start:start + count]))
+
+    @property
+    def period(self):
+        """Период качания в шагах: между первой и третьей сменой знака скорости"""
+        if self._period is None:
+            turns = []
+            k = 1
+            while len(turns) < 3:
+                if k + 1 >= len(self.speeds):
+                    if k > 100 * TRAJECTORY_CHUNK:
+                        return 0  # маятник не качается (нулевая сила)
+                    self.extend(TRAJECTORY_CHUNK)
+                if (self.speeds[k] > 0) != (self.speeds[k + 1] > 0):
+                    turns.append(k)
+                k += 1
+            self._period = turns[2] - turns[0]
+        return self._period
+
+
+trajectories = OrderedDict()  # (сила, стартовый угол) -> SwingTrajectory
+
+
+def get_trajectory(force, start_angle):
+    """Таблица маятника из LRU-кэша"""
+    key = (force, start_angle)
+    trajectory = trajectories.get(key)
+    if trajectory is not None:
+        trajectories.move_to_end(key)
+        return trajectory
+
+    trajectory = SwingTrajectory(force, start_angle)
+    trajectories[key] = trajectory
+    if len(trajectories) > TRAJECTORY_CACHE_SIZE:
+        trajectories.popitem(last=False)
+    return trajectory
+
+
+class Landing:
+    """
+    Прогноз падения: через frames кадров блок с центром center касается
+    башни или земли на высоте y с исходом state ("landed" или "miss");
+    hit — касание верхнего этажа, golden — попадание по центру.
+    state None — касания не будет (frames == -1).
+    Прогноз верен, пока башня та же (matches).
+    """
+
+    __slots__ = ("frames", "state", "hit", "golden", "center", "y", "tower_y", "size", "top_x")
+
+    def __init__(self, tower, frames, state, hit, golden, center, y):
+        self.frames = frames
+        self.state = state
+        self.hit = hit
+        self.golden = golden
+        self.center = center
+        self.y = y
+        self.tower_y = tower.y
+        self.size = tower.size
+        self.top_x = tower.xlist[-1] if tower.xlist else None
+
+    def matches(self, tower):
+        return (
+            tower.y == self.tower_y
+            and tower.size == self.size
+            and (tower.xlist[-1] if tower.xlist else None) == self.top_x
+        )
+
+
+class BlockModel:
+    """Маятник на верёвке и падающий блок"""
+
+    __slots__ = (
+        "x", "y", "xlast", "speed", "acceleration", "angle", "force", "state", "rotated",
+        "trajectory", "phase", "landing",
+    )
+
+    def __init__(self, force):
+        self.x = 370
+        self.y = 150
+        self.xlast = 0           # центр блока при сбросе
+        self.speed = 0
+        self.acceleration = 0
+        self.state = "ready"     # ready, dropped, landed, scroll, over, miss
+        self.angle = 45
+        self.force = force
+        self.rotated = False     # блок повёрнут анимацией падения на angle градусов
+        self.trajectory = get_trajectory(force, self.angle)
+        self.phase = 0           # шагов маятника с момента респауна
+        self.landing = None      # прогноз падения (Landing) после отпускания
+
+    def swing(self):
+        """Маятник (как в старом рабочем проекте) — шаг по таблице траектории"""
+        trajectory = self.trajectory
+        phase = self.phase
+        if phase >= len(trajectory.xs):
+            if phase >= TRAJECTORY_MAX_STEPS:
+                self.integrate()
+                return
+            trajectory.extend(TRAJECTORY_CHUNK)
+        self.x = trajectory.xs[phase]
+        self.y = trajectory.ys[phase]
+        phase += 1
+        self.angle = trajectory.angles[phase]
+        self.speed = trajectory.speeds[phase]
+        self.acceleration = trajectory.accelerations[phase]
+        self.phase = phase
+
+    def integrate(self):
+        """Шаг маятника без таблицы — когда блок висит дольше TRAJECTORY_MAX_STEPS"""
+        angle = self.angle
+        self.x = 370 + ROPE_LENGTH * sin(angle) - BLOCK_WIDTH // 2
+        self.y = 20 + ROPE_LENGTH * cos(angle)
+        angle += self.speed
+        self.angle = angle
+        self.acceleration = sin(angle) * self.force
+        self.speed += self.acceleration
+        self.phase += 1
+
+    def predict(self, steps):
+        """Позиция (x, y), в которой блок окажется через steps шагов качания"""
+        if steps <= 0:
+            return self.x, self.y
+        return self.trajectory.position(self.phase + steps - 1)
+
+    def drop(self, tower):
+        """
+        Падение блока. Исход решается один раз при отпускании
+        (predict_landing); дальше кадр только сдвигает блок, пока не
+        наступит кадр касания. Если башня за это время сдвинулась
+        (обрушение), прогноз пересчитывается.
+        """
+        if self.state == "ready":
+            self.state = "dropped"
+            # сохраняем ЦЕНТР блока, а не левый край
+            self.xlast = self.x + BLOCK_WIDTH // 2
+            self.landing = self.predict_landing(tower)
+        elif not self.landing.matches(tower):
+            self.landing = self.predict_landing(tower)
+
+        landing = self.landing
+        if landing.frames == 0:
+            if landing.hit:
+                tower.golden = landing.golden
+            self.state = landing.state
+            return
+
+        self.speed += GRAVITY
+        self.y += self.speed
+        if landing.frames > 0:
+            landing.frames -= 1
+
+    def predict_landing(self, tower, limit=1000):
+        """
+        Прогноз падения из текущих y и speed: через сколько кадров блок
+        коснётся башни или земли и чем это кончится. Те же проверки и та же
+        арифметика, что покадрово, поэтому прогноз совпадает бит в бит.
+        Если касания не будет за limit кадров — Landing с state None.
+        """
+        hit_x = False
+        top_center = 0
+        if tower.size != 0:
+            top_center = tower.xlist[-1] + BLOCK_WIDTH // 2
+            hit_x = (
+                self.xlast < top_center + BLOCK_WIDTH - 4
+                and self.xlast > top_center - (BLOCK_WIDTH - 4)
+            )
+        ground = 600 - BLOCK_HEIGHT
+
+        y = self.y
+        speed = self.speed
+        for frames in range(limit):
+            hit = hit_x and tower.y - y <= BLOCK_HEIGHT + 6
+            if y >= ground and tower.size >= 1:
+                state = "miss"
+            elif hit or (tower.size == 0 and y >= ground):
+                state = "landed"
+            else:
+                speed += GRAVITY
+                y += speed
+                continue
+
+            golden = hit and top_center - 5 < self.xlast < top_center + 5
+            return Landing(tower, frames, state, hit, golden, self.xlast, y)
+        return Landing(tower, -1, None, False, False, self.xlast, y)
+
+    def collided(self, tower):
+        """Столкновение с верхним этажом башни"""
+        if tower.size == 0:
+            return False
+
+        top_x = tower.xlist[-1] + BLOCK_WIDTH // 2  # центр верхнего блока
+
+        # допуск по X ~ ширина блока, по Y — высота + небольшой запас
+        if (
+            self.xlast < top_x + BLOCK_WIDTH - 4
+            and self.xlast > top_x - (BLOCK_WIDTH - 4)
+            and (tower.y - self.y) <= BLOCK_HEIGHT + 6
+        ):
+            # «золотой» попадание почти идеально по центру
+            if self.xlast < top_x + 5 and self.xlast > top_x - 5:
+                tower.golden = True
+            else:
+                tower.golden = False
+            return True
+        return False
+
+    def to_build(self, tower):
+        """После удачного приземления блок уходит в режим scroll"""
+        self.state = "scroll"
+        if tower.size == 0:
+            return True
+        landing = self.landing
+        if landing.hit and landing.matches(tower):
+            # башня не сдвинулась с кадра касания — повторная проверка не нужна
+            tower.golden = landing.golden
+            return True
+        return self.collided(tower)
+
+    def collapse(self, tower):
+        """
+        Если блок ушёл по X больше чем на 50% ширины относительно ВЕРХНЕГО этажа,
+        считаем, что он не удержался и падает.
+        """
+        if tower.size >= 1:
+            top_center = tower.xlist[-1] + BLOCK_WIDTH // 2
+            max_offset = BLOCK_WIDTH // 2  # 50% ширины: 48px при 96px блока
+
+            if self.xlast > top_center + max_offset or self.xlast < top_center - max_offset:
+                self.state = "over"
+
+    def rotate(self, direction):
+        if direction == "l":
+            self.angle += 1
+        if direction == "r":
+            self.angle -= 1
+        self.rotated = True
+
+    def to_fall(self, tower):
+        """Анимация падения после collapse/over"""
+        self.y += 5
+
+        if tower.size >= 1:
+            top_center = tower.xlist[-1] + BLOCK_WIDTH // 2
+            offset = BLOCK_WIDTH // 3  # небольшой «замах» при падении
+
+            if self.xlast < top_center + offset:
+                self.x -= 2
+                self.rotate("l")
+            elif self.xlast > top_center - offset:
+                self.x += 2
+                self.rotate("r")
+
+    def respawn(self, tower, force):
+        """Возврат блока на верёвку"""
+        if tower.size % 2 == 0:
+            self.angle = -45
+        else:
+            self.angle = 45
+        self.speed = 0
+        self.state = "ready"
+        self.force = force
+        self.rotated = False
+        self.trajectory = get_trajectory(force, self.angle)
+        self.phase = 0
+
+
+class TowerModel:
+    """
+    Этажи башни, прокрутка, раскачивание и обрушение.
+
+    Устойчивость считается по центру масс: xsums — префиксные суммы центров
+    этажей (xsums[i] — сумма первых i), поэтому центр масс любой части башни
+    над этажом берётся за O(1) (center_of_mass_above), а постройка этажа —
+    одно добавление в массив.
+    """
+
+    __slots__ = (
+        "size", "xbase", "y", "x", "height", "xlist", "xsums", "onscreen", "change", "speed",
+        "wobbling", "scrolling", "golden", "display_status",
+    )
+
+    def __init__(self):
+        self.size = 0
+        self.xbase = 0
+        self.y = 600
+        self.x = 0
+        self.height = 0
+        self.xlist = array("d")  # x центров всех этажей: 8 байт на этаж
+        self.xsums = array("d", [0])
+        self.onscreen = 0
+        self.change = 0
+        self.speed = 0.4
+        self.wobbling = False
+        self.scrolling = False
+        self.golden = False
+        self.display_status = True
+
+    def build(self, block_x):
+        """Новый этаж с центром упавшего блока"""
+        self.size += 1
+        self.onscreen += 1
+
+        if self.size == 1:
+            self.xbase = block_x
+
+        self.xlist.append(block_x)
+        self.xsums.append(self.xsums[-1] + block_x)
+
+        if self.size <= 5:
+            self.height = self.size * BLOCK_HEIGHT
+            self.y = 600 - self.height
+        else:
+            self.height += BLOCK_HEIGHT
+            self.y -= BLOCK_HEIGHT
+
+    def center_of_mass_above(self, floor):
+        """Центр масс (x) этажей выше floor; None, если выше ничего нет"""
+        count = len(self.xlist) - floor - 1
+        if count <= 0:
+            return None
+        return (self.xsums[-1] - self.xsums[floor + 1]) / count
+
+    def get_lean(self):
+        """Сдвиг центра масс всего, что стоит на основании, от центра основания"""
+        center = self.center_of_mass_above(0)
+        if center is None:
+            return 0
+        return center - self.xlist[0]
+
+    def get_overhang(self):
+        """
+        Наибольший (по модулю) сдвиг центра масс подстопки от этажа под ней —
+        для TOWER_SUBSTACK_DEPTH верхних этажей, O(1) по префиксным суммам
+        """
+        worst = 0
+        top = len(self.xlist) - 1
+        for floor in range(max(0, top - TOWER_SUBSTACK_DEPTH), top):
+            offset = self.center_of_mass_above(floor) - self.xlist[floor]
+            if abs(offset) > abs(worst):
+                worst = offset
+        return worst
+
+    def wobble(self):
+        lean = self.get_lean()
+        if (abs(lean) > TOWER_WOBBLE_LEAN and self.size >= 5) or self.size >= 20:
+            self.wobbling = True
+
+        if self.wobbling:
+            self.change += self.speed
+
+        # размах растёт с наклоном башни
+        share = min(1, max(abs(lean) / TOWER_COLLAPSE_LEAN, TOWER_WOBBLE_MIN_SHARE))
+        amplitude = TOWER_WOBBLE_AMPLITUDE * share
+        if self.change > amplitude:
+            self.speed = -0.4
+        elif self.change < -amplitude:
+            self.speed = 0.4
+
+    def scroll(self):
+        if self.y <= TOWER_SCROLL_LINE:
+            self.y += SCROLL_SPEED
+            self.scrolling = True
+        else:
+            self.height = TOWER_SCROLLED_HEIGHT
+            self.scrolling = False
+            self.onscreen = TOWER_SCROLLED_FLOORS
+
+    def reset(self):
+        if self.onscreen >= TOWER_MAX_ONSCREEN:
+            self.onscreen = TOWER_SCROLLED_FLOORS
+            self.y = TOWER_SCROLL_LINE
+
+    def unbuild(self, block):
+        self.display_status = False
+        if self.y > block.y:
+            block.y = self.y
+            self.size -= 1
+
+    def collapse(self, direction):
+        self.y += 5
+        if direction == "l":
+            self.x -= 5
+        elif direction == "r":
+            self.x += 5
+
+
+class Simulation:
+    """
+    Состояние одной партии и её покадровый шаг.
+
+    step() возвращает список событий (имя, значение) для отрисовки и звука:
+    ("build", x) — построен этаж; ("sound", имя); ("coins", n);
+    ("next_block", None) — на верёвку нужен следующий спрайт;
+    ("miss", None) — промах, очередь спрайтов сбрасывается;
+    ("round", None) — камера спустилась, начата новая башня.
+    """
+
+    def __init__(self):
+        self.force = INITIAL_FORCE
+        self.reset()
+
+    def reset(self):
+        self.tower = TowerModel()
+        # как и раньше, первый блок новой партии качается с силой прошлой
+        self.block = BlockModel(self.force)
+        self.score = 0
+        self.lives = MAX_LIVES
+        self.screenY = 0
+        self.force = INITIAL_FORCE
+        self.gameover = False
+        self.camera_descending = False
+        self.fall_sound_played = False
+        self.collapse_sound_played = False
+        self.frame = 0
+        # итоги партии для истории забегов
+        self.builds = 0
+        self.goldens = 0
+        self.misses = 0
+        self.miss_frame = -1
+
+    def drop(self):
+        """Отпустить блок (пробел); False, если сейчас нельзя"""
+        if self.block.state == "ready" and not self.camera_descending:
+            self.block.drop(self.tower)
+            return True
+        return False
+
+    def step(self):
+        self.frame += 1
+        events = []
+        block = self.block
+        tower = self.tower
+
+        if self.camera_descending:
+            if self.screenY > 0:
+                self.screenY -= CAMERA_DESCENT_SPEED
+                if self.screenY < 0:
+                    self.screenY = 0
+            else:
+                self.camera_descending = False
+                self.tower = TowerModel()
+                self.block = BlockModel(self.force)
+                events.append(("round", None))
+            return events
+
+        state = block.state
+
+        if state == "ready":
+            block.swing()
+        elif state == "dropped":
+            block.drop(tower)
+        elif state == "landed":
+            if block.to_build(tower):
+                tower.build(block.xlast)
+                events.append(("build", block.xlast))
+                self.builds += 1
+
+                if tower.golden:
+                    events.append(("sound", "gold"))
+                    self.goldens += 1
+                    self.score += 2
+                    events.append(("coins", 2))
+                else:
+                    events.append(("sound", "build"))
+                    self.score += 1
+                    events.append(("coins", 1))
+
+                events.append(("next_block", None))
+
+            if tower.size >= 2:
+                block.collapse(tower)
+        elif state == "over":
+            tower.unbuild(block)
+            block.to_fall(tower)
+            if not self.fall_sound_played:
+                self.fall_sound_played = True
+                events.append(("sound", "fall"))
+                events.append(("sound", "overmusic"))
+        elif state == "scroll" and not tower.scrolling:
+            self.force *= FORCE_MULTIPLIER
+            block.respawn(tower, self.force)
+            if tower.size >= 5:
+                tower.reset()
+            self.fall_sound_played = False
+        elif state == "miss":
+            events.append(("sound", "overmusic"))
+            events.append(("miss", None))
+
+            tower.y = 2000
+            self.lose_life()
+
+        if tower.height >= BLOCK_HEIGHT * 5 and tower.size >= 5:
+            tower.scroll()
+            self.screenY += SCROLL_SPEED
+
+        tower.wobble()
+        self.check_gameover(events)
+        return events
+
+    def lose_life(self):
+        # промах на земле отнимает жизнь дважды за шаг — в истории это один промах
+        if self.miss_frame != self.frame:
+            self.miss_frame = self.frame
+            self.misses += 1
+        self.lives -= 1
+        if self.lives <= 0:
+            self.gameover = True
+        else:
+            self.camera_descending = True
+
+    def check_gameover(self, events):
+        tower = self.tower
+        block = self.block
+        # рушится вся башня (центр масс над основанием) или верх (подстопка за краем этажа)
+        lean = tower.get_lean()
+        overhang = tower.get_overhang()
+        if lean < -TOWER_COLLAPSE_LEAN or overhang < -TOWER_SUBSTACK_OVERHANG:
+            tower.collapse("l")
+            if not self.collapse_sound_played:
+                self.collapse_sound_played = True
+                events.append(("sound", "overmusic"))
+        elif lean > TOWER_COLLAPSE_LEAN or overhang > TOWER_SUBSTACK_OVERHANG:
+            tower.collapse("r")
+            if not self.collapse_sound_played:
+                self.collapse_sound_played = True
+                events.append(("sound", "overmusic"))
+
+        if tower.y > 600:
+            block.x = 2000
+            tower.size -= 1
+            self.lose_life()
+            self.collapse_sound_played = False
+
+        elif block.state == "over" and block.y > 600:
+            tower.y = 2000
+            tower.size -= 1
+            self.lose_life()
+            self.fall_sound_played = False
@@ -1,31 +1,24 @@
-"""Класс блока (маятник + очередь спрайтов, падение при смещении >50%)"""
+"""Отрисовка блока на верёвке; правила маятника и падения — в core.simulation.BlockModel"""
 import pygame
-from math import sin, cos
 from config import (
-    GRAVITY,
-    ROPE_LENGTH,
     ORIGIN,
     BLOCK_HEIGHT,
     BLOCK_WIDTH,
+    INTERPOLATION_SNAP,
 )
 
 
 class Block(pygame.sprite.Sprite):
-    def __init__(self, image, force):
+    def __init__(self, model, image, resource_manager=None):
         pygame.sprite.Sprite.__init__(self)
+        self.model = model
+        self.resource_manager = resource_manager
         self.image = image if image is not None else self.create_default_block()
         self.rotimg = self.image
-        self.x = 370
-        self.y = 150
-        self.xlast = 0           # центр блока при сбросе
-        self.xchange = 100
-        self.speed = 0
-        self.acceleration = 0
-        self.speedmultiplier = 1
+        self.rotation = None  # (спрайт, угол), под которые построен rotimg
         self.rect = self.image.get_rect()
-        self.state = "ready"     # ready, dropped, landed, scroll, over, miss
-        self.angle = 45
-        self.force = force
+        self.prev_x = self.render_x = model.x  # для интерполяции между шагами
+        self.prev_y = self.render_y = model.y
 
     def create_default_block(self):
         surf = pygame.Surface((BLOCK_WIDTH, BLOCK_HEIGHT), pygame.SRCALPHA)
@@ -38,109 +31,59 @@ class Block(pygame.sprite.Sprite):
         )
         return surf
 
-    def get_state(self):
-        return self.state
-
-    def swing(self):
-        """Маятник (как в старом рабочем проекте)"""
-        self.x = 370 + ROPE_LENGTH * sin(self.angle) - BLOCK_WIDTH // 2
-        self.y = 20 + ROPE_LENGTH * cos(self.angle)
-        self.angle += self.speed
-        self.acceleration = sin(self.angle) * self.force
-        self.speed += self.acceleration
-
-    def drop(self, tower):
-        """Падение блока"""
-        if self.state == "ready":
-            self.state = "dropped"
-            # сохраняем ЦЕНТР блока, а не левый край
-            self.xlast = self.x + BLOCK_WIDTH // 2
-
-        if self.collided(tower):
-            self.state = "landed"
-
-        if tower.size == 0 and self.y >= 600 - BLOCK_HEIGHT:
-            self.state = "landed"
-
-        if tower.size >= 1 and self.y >= 600 - BLOCK_HEIGHT:
-            self.state = "miss"
-
-        if self.state == "dropped":
-            self.speed += GRAVITY
-            self.y += self.speed
-
-    def collided(self, tower):
-        """Столкновение с верхним этажом башни"""
-        if tower.size == 0:
-            return False
-
-        top_x = tower.xlist[-1] + BLOCK_WIDTH // 2  # центр верхнего блока
-
-        # допуск по X ~ ширина блока, по Y — высота + небольшой запас
-        if (
-            self.xlast < top_x + BLOCK_WIDTH - 4
-            and self.xlast > top_x - (BLOCK_WIDTH - 4)
-            and (tower.y - self.y) <= BLOCK_HEIGHT + 6
-        ):
-            # «золотой» попадание почти идеально по центру
-            if self.xlast < top_x + 5 and self.xlast > top_x - 5:
-                tower.golden = True
-            else:
-                tower.golden = False
-            return True
-        return False
-
-    def to_build(self, tower):
-        """После удачного приземления блок уходит в режим scroll"""
-        self.state = "scroll"
-        if tower.size == 0 or self.collided(tower):
-            return True
-        return False
-
-    def collapse(self, tower):
-        """
-        Если блок ушёл по X больше чем на 50% ширины относительно ВЕРХНЕГО этажа,
-        считаем, что он не удержался и падает.
-        """
-        if tower.size >= 1:
-            top_center = tower.xlist[-1] + BLOCK_WIDTH // 2
-            max_offset = BLOCK_WIDTH // 2  # 50% ширины: 48px при 96px блока
-
-            if self.xlast > top_center + max_offset or self.xlast < top_center - max_offset:
-                self.state = "over"
-
-    def rotate(self, direction):
-        if direction == "l":
-            self.angle += 1
-        if direction == "r":
-            self.angle -= 1
-        self.rotimg = pygame.transform.rotate(self.image, self.angle)
-
-    def to_fall(self, tower):
-        """Анимация падения после collapse/over"""
-        self.y += 5
-
-        if tower.size >= 1:
-            top_center = tower.xlist[-1] + BLOCK_WIDTH // 2
-            offset = BLOCK_WIDTH // 3  # небольшой «замах» при падении
-
-            if self.xlast < top_center + offset:
-                self.x -= 2
-                self.rotate("l")
-            elif self.xlast > top_center - offset:
-                self.x += 2
-                self.rotate("r")
+    def set_image(self, image):
+        """Следующий спрайт из очереди скина"""
+        self.image = image
+        self.rotimg = image
+        self.rotation = None
+
+    def update_rotation(self):
+        """Повернуть спрайт на угол модели, если она в анимации падения"""
+        if not self.model.rotated:
+            self.rotimg = self.image
+            self.rotation = None
+            return
+
+        key = (self.image, self.model.angle)
+        if key == self.rotation:
+            return
+        if self.resource_manager:
+            self.rotimg = self.resource_manager.get_rotated_image(self.image, self.model.angle)
+        else:
+            self.rotimg = pygame.transform.rotate(self.image, self.model.angle)
+        self.rotation = key
+
+    def remember(self):
+        """Запомнить позицию перед шагом симуляции"""
+        self.prev_x = self.model.x
+        self.prev_y = self.model.y
+
+    def interpolate(self, alpha):
+        """Позиция для отрисовки между прошлым и текущим шагом (alpha 0..1)"""
+        x, y = self.model.x, self.model.y
+        jumped = (
+            abs(x - self.prev_x) >= INTERPOLATION_SNAP
+            or abs(y - self.prev_y) >= INTERPOLATION_SNAP
+        )
+        if alpha >= 1 or jumped:
+            self.render_x, self.render_y = x, y
+        else:
+            self.render_x = self.prev_x + (x - self.prev_x) * alpha
+            self.render_y = self.prev_y + (y - self.prev_y) * alpha
+        self.update_rotation()
 
-    def display(self, screen, tower):
-        if not tower.is_scrolling():
+    def display(self, screen, tower, camera):
+        if not tower.model.scrolling:
             pygame.draw.circle(screen, (200, 0, 0), ORIGIN, 5, 0)
-            screen.blit(self.rotimg, (self.x, self.y))
-            if self.state == "ready":
+            # блок, улетевший за экран (промах, падение), не рисуется
+            if camera.is_visible(self.rotimg.get_rect(topleft=(self.render_x, self.render_y))):
+                screen.blit(self.rotimg, (self.render_x, self.render_y))
+            if self.model.state == "ready":
                 self.draw_rope(screen)
 
     def draw_rope(self, screen):
-        hook_x = self.x + BLOCK_WIDTH // 2
-        hook_y = self.y
+        hook_x = self.render_x + BLOCK_WIDTH // 2
+        hook_y = self.render_y
         pygame.draw.aaline(screen, (0, 0, 0), ORIGIN, (hook_x, hook_y))
         pygame.draw.circle(
             screen,
@@ -150,13 +93,21 @@ class Block(pygame.sprite.Sprite):
             0,
         )
 
-    def respawn(self, tower, force):
-        """Возврат блока на верёвку"""
-        if tower.size % 2 == 0:
-            self.angle = -45
-        else:
-            self.angle = 45
-        self.speed = 0
-        self.state = "ready"
-        self.force = force
-        self.rotimg = self.image
+    def get_rope_rect(self):
+        """Область верёвки и крючка из draw_rope()"""
+        hook_x = self.render_x + BLOCK_WIDTH // 2
+        hook_y = self.render_y
+        rect = pygame.Rect(
+            min(ORIGIN[0], hook_x), min(ORIGIN[1], hook_y),
+            abs(hook_x - ORIGIN[0]) + 1, abs(hook_y - ORIGIN[1]) + 1,
+        )
+        rect.union_ip((int(hook_x) - 5, int(hook_y + 2.5) - 5, 11, 11))
+        return rect.inflate(2, 2)
+
+    def get_dirty_rect(self):
+        """Область экрана, которую задевает display() в текущем состоянии"""
+        rect = self.rotimg.get_rect(topleft=(self.render_x, self.render_y)).inflate(2, 2)
+        rect.union_ip((ORIGIN[0] - 5, ORIGIN[1] - 5, 11, 11))
+        if self.model.state == "ready":
+            rect.union_ip(self.get_rope_rect())
+        return rect
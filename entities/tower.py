@@ -1,30 +1,43 @@
-"""Башня: первый этаж bot, остальные — тот же спрайт, что висел на верёвке"""
+"""Башня: первый этаж bot, остальные — тот же спрайт, что висел на верёвке.
+
+Правила (этажи, прокрутка, раскачивание) — в core.simulation.TowerModel,
+здесь только холст со спрайтами этажей.
+"""
 import pygame
-from config import BLOCK_HEIGHT, BLOCK_WIDTH
+from array import array
+from collections import deque
+from config import (
+    BLOCK_HEIGHT,
+    SCREEN_WIDTH,
+    TOWER_CANVAS_FLOORS,
+    INTERPOLATION_SNAP,
+)
 
 
 class Tower(pygame.sprite.Sprite):
-    def __init__(self, resource_manager, skin_id="tower_1"):
+    def __init__(self, model, resource_manager, skin_id="tower_1"):
         pygame.sprite.Sprite.__init__(self)
+        self.model = model
         self.resource_manager = resource_manager
         self.skin_id = skin_id
-        self.size = 0
         self.rect = pygame.Rect(0, 0, 0, 0)
-        self.xbase = 0
-        self.y = 600
-        self.x = 0
-        self.height = 0
-        self.xlist = []
-        self.onscreen = 0
-        self.change = 0
-        self.speed = 0.4
-        self.wobbling = False
-        self.scrolling = False
-        self.golden = False
-        self.redraw = False
-        self.display_status = True
-
-        self.floors = []  # [{'x': ..., 'sprite': ...}]
+
+        # позиция прошлого шага и позиция для отрисовки (интерполяция)
+        self.prev_pos = self.render_pos = (model.x + model.change, model.y)
+
+        # Постоянный холст башни: этажи дорисовываются в add_floor(),
+        # а каждый кадр блитится только видимая верхняя часть
+        self.canvas_floors = TOWER_CANVAS_FLOORS
+
+        # живые записи только для этажей, что помещаются на холст;
+        # вся история — в массивах: x этажа и номер спрайта в palette
+        self.floors = deque(maxlen=self.canvas_floors)  # [{'x': ..., 'sprite': ...}]
+        self.history_x = array("d")
+        self.history_sprite = array("H")
+        self.palette = []         # спрайты этажей по номерам
+        self.palette_index = {}   # спрайт -> номер
+        self.canvas = self.create_canvas(self.canvas_floors)
+        self.canvas_count = 0  # сколько этажей сейчас лежит на холсте
 
         self.load_parts()
 
@@ -35,108 +48,132 @@ class Tower(pygame.sprite.Sprite):
         self.skin_id = skin_id
         self.load_parts()
 
-    def build(self, block_x, block_sprite):
-        """Строим этаж, используя спрайт упавшего блока"""
-        self.size += 1
-        self.onscreen += 1
-
-        if self.size == 1:
-            self.xbase = block_x
+    def add_floor(self, block_x, block_sprite):
+        """Модель построила этаж — кладём на холст спрайт упавшего блока"""
+        if not self.history_x:
             sprite = self.parts.get("base", block_sprite)
         else:
             sprite = block_sprite
 
-        self.xlist.append(block_x)
         self.floors.append({"x": block_x, "sprite": sprite})
-
-        if self.size <= 5:
-            self.height = self.size * BLOCK_HEIGHT
-            self.y = 600 - self.height
-        else:
-            self.height += BLOCK_HEIGHT
-            self.y -= BLOCK_HEIGHT
-
-    def draw(self):
-        if self.size >= 1:
-            max_height = self.onscreen * BLOCK_HEIGHT
-            surf = pygame.Surface((800, max_height), pygame.SRCALPHA)
-            surf.convert_alpha()
-
-            floors_to_draw = (
-                self.floors[-self.onscreen :] if self.redraw else self.floors
+        self.history_x.append(block_x)
+        self.history_sprite.append(self.get_sprite_index(sprite))
+        self.add_to_canvas(block_x, sprite)
+
+    def get_sprite_index(self, sprite):
+        index = self.palette_index.get(sprite)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(sprite)
+            self.palette_index[sprite] = index
+        return index
+
+    def floor_count(self):
+        return len(self.history_x)
+
+    def get_floor(self, index):
+        """Этаж из истории: (x, спрайт); индекс как у списка"""
+        return self.history_x[index], self.palette[self.history_sprite[index]]
+
+    def create_canvas(self, floors):
+        return pygame.Surface(
+            (SCREEN_WIDTH, floors * BLOCK_HEIGHT), pygame.SRCALPHA
+        ).convert_alpha()
+
+    def add_to_canvas(self, x, sprite):
+        """Дорисовать новый этаж: он всегда в верхнем ряду холста"""
+        if self.model.onscreen > self.canvas_floors:
+            self.grow_canvas()
+            return
+
+        # старые этажи сдвигаются на ряд вниз, самый нижний уходит
+        self.canvas.scroll(0, BLOCK_HEIGHT)
+        self.canvas.fill((0, 0, 0, 0), (0, 0, SCREEN_WIDTH, BLOCK_HEIGHT))
+        if sprite:
+            self.canvas.blit(sprite, (x, 0))
+        self.canvas_count = min(self.canvas_count + 1, self.canvas_floors)
+
+    def grow_canvas(self):
+        """Холст меньше видимой части башни — пересоздаём его крупнее"""
+        while self.canvas_floors < self.model.onscreen:
+            self.canvas_floors *= 2
+        self.canvas = self.create_canvas(self.canvas_floors)
+        self.canvas_count = 0
+
+        # окно живых записей растёт вместе с холстом — добираем из истории
+        total = self.floor_count()
+        self.floors = deque(
+            (
+                {"x": x, "sprite": sprite}
+                for x, sprite in map(self.get_floor, range(max(0, total - self.canvas_floors), total))
+            ),
+            maxlen=self.canvas_floors,
+        )
+        for floor in self.floors:
+            self.add_to_canvas(floor["x"], floor["sprite"])
+
+    def trim_canvas(self):
+        """Стереть с холста этажи, которые уже не попадут на экран"""
+        onscreen = self.model.onscreen
+        if self.canvas_count > onscreen:
+            top = onscreen * BLOCK_HEIGHT
+            self.canvas.fill(
+                (0, 0, 0, 0),
+                (0, top, SCREEN_WIDTH, self.canvas_floors * BLOCK_HEIGHT - top),
             )
+            self.canvas_count = onscreen
 
-            for i, floor in enumerate(floors_to_draw):
-                floor_sprite = floor["sprite"]
-                if floor_sprite:
-                    y_pos = max_height - BLOCK_HEIGHT * (i + 1)
-                    surf.blit(floor_sprite, (floor["x"], y_pos))
-        else:
-            surf = pygame.Surface((0, 0))
+    def get_canvas_area(self):
+        """Прямоугольник холста с верхними onscreen этажами"""
+        rows = min(self.model.onscreen, self.canvas_count)
+        if self.model.size < 1 or rows <= 0:
+            return pygame.Rect(0, 0, 0, 0)
+        return pygame.Rect(0, 0, SCREEN_WIDTH, rows * BLOCK_HEIGHT)
 
+    def draw(self):
+        area = self.get_canvas_area()
+        surf = self.canvas.subsurface(area)
         self.rect = surf.get_rect()
         return surf
 
-    def get_display(self):
-        return self.display_status
-
-    def is_scrolling(self):
-        return self.scrolling
-
-    def is_golden(self):
-        return self.golden
-
-    def get_width(self):
-        width = BLOCK_WIDTH
-        if self.size == 0 or self.size == -1:
-            return width
-        if self.xlist[-1] > self.xbase:
-            width = (self.xlist[-1] - self.xbase) + BLOCK_WIDTH
-        if self.xlist[-1] < self.xbase:
-            width = -((self.xbase - self.xlist[-1]) + BLOCK_WIDTH)
-        return width
-
-    def wobble(self):
-        width = self.get_width()
-        if ((width > 100 or width < -100) and self.size >= 5) or self.size >= 20:
-            self.wobbling = True
-
-        if self.wobbling:
-            self.change += self.speed
-
-        if self.change > 20:
-            self.speed = -0.4
-        elif self.change < -20:
-            self.speed = 0.4
-
-    def display(self, screen):
-        surf = self.draw()
-        screen.blit(surf, (self.x + self.change, self.y))
-
-    def scroll(self):
-        if self.y <= 440:
-            self.y += 5
-            self.scrolling = True
+    def get_dirty_rect(self):
+        """Где на экране окажется холст с учётом раскачивания"""
+        area = self.get_canvas_area()
+        return pygame.Rect(self.render_pos, area.size).inflate(2, 0)
+
+    def remember(self):
+        """Запомнить позицию перед шагом симуляции"""
+        self.prev_pos = (self.model.x + self.model.change, self.model.y)
+
+    def interpolate(self, alpha):
+        """Позиция для отрисовки между прошлым и текущим шагом (alpha 0..1)"""
+        # после прокрутки/сброса модели лишние этажи убираются с холста
+        self.trim_canvas()
+
+        x, y = self.model.x + self.model.change, self.model.y
+        prev_x, prev_y = self.prev_pos
+        jumped = abs(x - prev_x) >= INTERPOLATION_SNAP or abs(y - prev_y) >= INTERPOLATION_SNAP
+        if alpha >= 1 or jumped:
+            self.render_pos = (x, y)
         else:
-            self.height = 160
-            self.scrolling = False
-            self.onscreen = 3
-
-    def reset(self):
-        self.redraw = True
-        if self.onscreen >= 7:
-            self.onscreen = 3
-            self.y = 440
-
-    def unbuild(self, block):
-        self.display_status = False
-        if self.y > block.y:
-            block.y = self.y
-            self.size -= 1
-
-    def collapse(self, direction):
-        self.y += 5
-        if direction == "l":
-            self.x -= 5
-        elif direction == "r":
-            self.x += 5
+            self.render_pos = (prev_x + (x - prev_x) * alpha, prev_y + (y - prev_y) * alpha)
+
+    def display(self, screen, camera):
+        """Блит видимых этажей; то, что за краем экрана, не трогается"""
+        area = self.get_canvas_area()
+        self.rect = pygame.Rect(0, 0, area.width, area.height)
+        if not area.height:
+            return
+
+        dest = pygame.Rect(self.render_pos, area.size)
+        if camera.viewport.contains(dest):
+            screen.blit(self.canvas, self.render_pos, area)
+            return
+
+        visible = camera.clip(dest)
+        if visible:
+            area = pygame.Rect(
+                area.x + visible.x - dest.x, area.y + visible.y - dest.y,
+                visible.width, visible.height,
+            )
+            screen.blit(self.canvas, visible.topleft, area)
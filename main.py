@@ -2,6 +2,7 @@
 import pygame
 import os
 import sys
+import argparse
 
 
 def check_and_prepare_resources():
@@ -129,8 +130,55 @@ def check_and_prepare_resources():
         return response == 'y'
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Tower Bloxx")
+    parser.add_argument("--headless", action="store_true",
+                        help="без окна, звука и ограничения FPS (для профилирования)")
+    parser.add_argument("--frames", type=int,
+                        help="сколько кадров прогнать в headless-режиме "
+                             "(по умолчанию 3600, для --replay — длина записи)")
+    parser.add_argument("--script", help="JSONL-сценарий ввода для headless-режима")
+    parser.add_argument("--record", help="записать ввод игрока в JSONL-файл")
+    parser.add_argument("--replay",
+                        help="проиграть запись с максимальной скоростью (включает --headless)")
+    parser.add_argument("--drop-every", type=int, default=90,
+                        help="без сценария: отпускать блок каждые N кадров")
+    parser.add_argument("--no-render", action="store_true",
+                        help="headless без отрисовки кадров (только симуляция)")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    args.headless = args.headless or bool(args.replay)
     try:
+        if args.headless:
+            from core.game import Game
+            from core.input_script import InputScript
+            from core.simulation import RULES_VERSION
+
+            frames = args.frames or 3600
+            if args.replay:
+                script = InputScript.load(args.replay)
+                if not script.compatible():
+                    print(f"Replay was recorded under rules {script.rules or 'before versioning'}, "
+                          f"current rules are {RULES_VERSION}: scores cannot be checked")
+                    sys.exit(1)
+                frames = args.frames or script.end_frame()
+            elif args.script:
+                script = InputScript.load(args.script)
+            else:
+                script = InputScript.drop_every(args.drop_every, frames)
+            game = Game(headless=True, record_path=args.record)
+            report = game.run_headless(script, frames, render=not args.no_render)
+            if args.replay:
+                recorded = script.scores()
+                same = report["scores"][:len(recorded)] == recorded
+                print(f"Replay scores {'match' if same else 'DIFFER from'} recording: "
+                      f"{report['scores']} vs {recorded}")
+                sys.exit(0 if same else 1)
+            sys.exit(0)
+
         # Автоматическая проверка и подготовка ресурсов
         if not check_and_prepare_resources():
             print("Exiting...")
@@ -138,11 +186,14 @@ if __name__ == "__main__":
         
         # Запуск игры
         from core.game import Game
-        game = Game()
+        game = Game(record_path=args.record)
         game.run()
         
     except KeyboardInterrupt:
         print("\n\nGame interrupted by user")
+        if "game" in globals():
+            game.save_recording()
+            game.close_storage()
         sys.exit(0)
     except Exception as e:
         print("\n" + "=" * 70)
@@ -152,5 +203,6 @@ if __name__ == "__main__":
         import traceback
         traceback.print_exc()
         print("\n" + "=" * 70)
-        input("\nPress Enter to exit...")
+        if not args.headless:
+            input("\nPress Enter to exit...")
         sys.exit(1)
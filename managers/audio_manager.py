@@ -4,14 +4,20 @@ import os
 from config import ASSETS_PATH, AUDIO_PATH
 
 class AudioManager:
-    def __init__(self, resource_manager):
+    def __init__(self, resource_manager, enabled=True):
         self.resource_manager = resource_manager
-        pygame.mixer.pre_init(44100, 16, 2, 4096)
-        pygame.mixer.init()
+        # enabled=False — без микшера: все методы ничего не делают (headless)
+        self.enabled = enabled
+        if enabled:
+            pygame.mixer.pre_init(44100, 16, 2, 4096)
+            pygame.mixer.init()
         self.music_loaded = False
         
     def load_resources(self):
         """Загрузка всех звуков"""
+        if not self.enabled:
+            return
+        
         # Пробуем разные пути для музыки
         music_paths = [
             os.path.join(AUDIO_PATH, "bgm.wav"),
@@ -65,7 +71,7 @@ class AudioManager:
     
     def play_music(self, loop=-1):
         """Воспроизведение фоновой музыки"""
-        if self.music_loaded:
+        if self.enabled and self.music_loaded:
             try:
                 pygame.mixer.music.play(loop)
             except Exception as e:
@@ -73,6 +79,8 @@ class AudioManager:
     
     def play_sound(self, name):
         """Воспроизведение звукового эффекта"""
+        if not self.enabled:
+            return
         sound = self.resource_manager.get_sound(name)
         if sound:
             try:
@@ -82,11 +90,15 @@ class AudioManager:
     
     def set_music_volume(self, volume):
         """Установить громкость музыки (0.0 - 1.0)"""
+        if not self.enabled:
+            return
         volume = max(0.0, min(1.0, volume))
         pygame.mixer.music.set_volume(volume)
     
     def set_sound_volume(self, volume):
         """Установить громкость звуков (0.0 - 1.0)"""
+        if not self.enabled:
+            return
         volume = max(0.0, min(1.0, volume))
         for sound in self.resource_manager.sounds.values():
             if sound:
@@ -0,0 +1,53 @@
+"""Общий реестр шрифтов и LRU-кэш отрисованного текста для всех UI-модулей"""
+import pygame
+from collections import OrderedDict
+from config import DEFAULT_FONT, TEXT_CACHE_SIZE
+
+
+class FontManager:
+    def __init__(self, max_cached=TEXT_CACHE_SIZE):
+        self.fonts = {}  # (face, size) -> pygame.font.Font
+        self.text_cache = OrderedDict()  # (font, text, antialias, color) -> Surface
+        self.max_cached = max_cached
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size, face=DEFAULT_FONT):
+        """Каждый (face, size) загружается один раз"""
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(face, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, font, text, antialias, color):
+        """
+        Как font.render, но из кэша. Возвращаемая поверхность общая —
+        её можно только блитить, но не менять.
+        """
+        key = (font, text, antialias, tuple(color))
+        surf = self.text_cache.get(key)
+        if surf is not None:
+            self.text_cache.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.text_cache[key] = surf
+        if len(self.text_cache) > self.max_cached:
+            self.text_cache.popitem(last=False)
+        return surf
+
+    def get_stats(self):
+        return {
+            "fonts": len(self.fonts),
+            "cached_texts": len(self.text_cache),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# единственный реестр на всю игру
+fonts = FontManager()
@@ -0,0 +1,74 @@
+"""
+Фоновый поток для всей записи на диск.
+
+Главный поток только кладёт задачу в очередь (снимок данных + функция
+записи) и сразу возвращается к кадру; сериализация, fsync и подмена
+файла идут здесь. Задачи выполняются строго по очереди, поэтому более
+поздний снимок никогда не перезапишется более ранним.
+"""
+import atexit
+import queue
+import threading
+import time
+
+
+class PersistenceWorker:
+    def __init__(self, name="persistence"):
+        self.queue = queue.Queue()
+        self.jobs = 0           # выполнено задач
+        self.errors = 0         # задач, завершившихся исключением
+        self.busy_time = 0.0    # суммарное время записи, с
+        self.max_job_time = 0.0
+        self.closed = False
+        self.thread = threading.Thread(target=self.loop, name=name, daemon=True)
+        self.thread.start()
+        # поток демонический: если игра упала, не дописав очередь, дописываем при выходе
+        atexit.register(self.close)
+
+    def submit(self, job, *args):
+        """Поставить job(*args) в очередь; не блокирует"""
+        if self.closed:
+            job(*args)  # после close() потока уже нет — пишем сами
+            return
+        self.queue.put((job, args))
+
+    def loop(self):
+        while True:
+            task = self.queue.get()
+            if task is None:
+                self.queue.task_done()
+                return
+            job, args = task
+            started = time.perf_counter()
+            try:
+                job(*args)
+            except Exception as e:
+                self.errors += 1
+                print(f"Persistence error: {e}")
+            elapsed = time.perf_counter() - started
+            self.jobs += 1
+            self.busy_time += elapsed
+            self.max_job_time = max(self.max_job_time, elapsed)
+            self.queue.task_done()
+
+    def drain(self):
+        """Дождаться, пока выполнятся все поставленные задачи"""
+        self.queue.join()
+
+    def close(self):
+        """Дописать очередь и остановить поток (повторный вызов ничего не делает)"""
+        if self.closed:
+            return
+        self.drain()
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
+
+    def get_stats(self):
+        return {
+            "jobs": self.jobs,
+            "errors": self.errors,
+            "pending": self.queue.qsize(),
+            "busy_time": self.busy_time,
+            "max_job_time": self.max_job_time,
+        }
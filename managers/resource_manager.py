@@ -2,14 +2,18 @@
 import pygame
 import os
 import itertools
-from config import TOWER_MID_PARTS_COUNT
+from collections import OrderedDict
+from config import TOWER_MID_PARTS_COUNT, ROTATION_STEP, ROTATION_CACHE_SIZE
+from managers.texture_atlas import TextureAtlas
 
 class ResourceManager:
     def __init__(self):
         self.images = {}
-        self.tower_sprites = {}
+        self.tower_sprites = {}  # части скинов — подповерхности атласа
+        self.atlas = TextureAtlas()
         self.sounds = {}
         self.next_block_cycle = {}
+        self.rotations = OrderedDict()  # (спрайт, угол) -> повёрнутый спрайт
 
     def load_image(self, name, path):
         try:
@@ -38,28 +42,59 @@ class ResourceManager:
         return self.sounds.get(name)
 
     def load_tower_parts(self, skin_id):
-        if skin_id in self.tower_sprites:
-            return self.tower_sprites[skin_id]
+        if skin_id not in self.tower_sprites:
+            self.load_tower_skins([skin_id])
+        return self.tower_sprites[skin_id]
 
-        parts = {"base": None, "middle_list": []}
-        tower_num = skin_id.split("_")[1]
-        folder = f"towers/tower_{tower_num}"
+    def load_tower_skins(self, skin_ids):
+        """Загрузить части нескольких скинов и упаковать их в одну страницу атласа"""
+        raw = {}
+        for skin_id in skin_ids:
+            if skin_id in self.tower_sprites:
+                continue
+            tower_num = skin_id.split("_")[1]
+            folder = os.path.join("assets", "towers", f"tower_{tower_num}")
 
-        base_path = os.path.join(folder, f"tower_{tower_num}_bot.png")
-        base_img = self.load_image(f"{skin_id}_base", base_path)
-        if base_img:
-            parts["base"] = base_img
-            print(f"Loaded: {base_path}")
+            paths = {f"{skin_id}_base": f"tower_{tower_num}_bot.png"}
+            for i in range(TOWER_MID_PARTS_COUNT):
+                paths[f"{skin_id}_mid_{i}"] = f"tower_{tower_num}_mid_{i}.png"
 
-        for i in range(TOWER_MID_PARTS_COUNT):
-            mid_path = os.path.join(folder, f"tower_{tower_num}_mid_{i}.png")
-            mid_img = self.load_image(f"{skin_id}_mid_{i}", mid_path)
-            if mid_img:
-                parts["middle_list"].append(mid_img)
-                print(f"Loaded: {mid_path}")
+            for name, filename in paths.items():
+                path = os.path.join(folder, filename)
+                try:
+                    # без convert_alpha: формат приводится один раз при упаковке
+                    raw[name] = pygame.image.load(path)
+                    print(f"Loaded: {path}")
+                except Exception as e:
+                    print(f"Error loading image {path}: {e}")
 
-        self.tower_sprites[skin_id] = parts
-        return parts
+        sprites = self.atlas.pack(raw)
+
+        for skin_id in skin_ids:
+            if skin_id in self.tower_sprites:
+                continue
+            parts = {"base": sprites.get(f"{skin_id}_base"), "middle_list": []}
+            for i in range(TOWER_MID_PARTS_COUNT):
+                mid_img = sprites.get(f"{skin_id}_mid_{i}")
+                if mid_img:
+                    parts["middle_list"].append(mid_img)
+            self.tower_sprites[skin_id] = parts
+
+    def get_rotated_image(self, image, angle):
+        """Повёрнутый спрайт из LRU-кэша; угол округляется до ROTATION_STEP"""
+        step = ROTATION_STEP
+        angle = round(angle / step) * step % 360
+        key = (image, angle)
+        rotated = self.rotations.get(key)
+        if rotated is not None:
+            self.rotations.move_to_end(key)
+            return rotated
+
+        rotated = pygame.transform.rotate(image, angle)
+        self.rotations[key] = rotated
+        if len(self.rotations) > ROTATION_CACHE_SIZE:
+            self.rotations.popitem(last=False)
+        return rotated
 
     def get_next_block_sprite(self, skin_id):
         if skin_id not in self.next_block_cycle:
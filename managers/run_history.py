@@ -0,0 +1,186 @@
+"""
+История законченных партий в SQLite.
+
+record() только кладёт строку в память — на Game Over это ничего не стоит.
+Строки уходят в базу пачкой (одна транзакция) через flush(): по размеру
+пачки или по таймеру из tick() и при выходе; с worker (PersistenceWorker)
+запись идёт в фоновом потоке через его собственное соединение.
+
+Запросы читают базу через отдельное соединение главного потока (WAL:
+чтение не ждёт записи) и видят партии, уже сброшенные flush(). Все они
+идут по индексам, поэтому не зависят от числа партий в истории:
+    runs_score      (score DESC, id)        — лучшие партии;
+    runs_skin_score (skin, score DESC, id)  — лучшие по скину;
+    id (rowid) растёт со временем           — последние партии.
+"""
+import os
+import queue
+import sqlite3
+import time
+from config import RUN_HISTORY_FILE, RUN_HISTORY_BATCH, RUN_HISTORY_FLUSH_INTERVAL
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    score INTEGER NOT NULL,
+    floors INTEGER NOT NULL,
+    goldens INTEGER NOT NULL,
+    misses INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    skin TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_score ON runs (score DESC, id);
+CREATE INDEX IF NOT EXISTS runs_skin_score ON runs (skin, score DESC, id);
+"""
+
+COLUMNS = ("id", "finished_at", "score", "floors", "goldens", "misses", "duration", "skin")
+INSERT = ("INSERT INTO runs (finished_at, score, floors, goldens, misses, duration, skin) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+
+class RunHistory:
+    def __init__(self, path=RUN_HISTORY_FILE, read_only=False, worker=None):
+        self.path = path
+        # read_only — история читается, но новые партии не пишутся (headless-прогоны)
+        self.read_only = read_only
+        self.worker = worker
+        self.pending = []        # партии, ещё не отданные на запись
+        self.pending_since = 0.0
+        self.writer = None       # соединение для записи — создаётся в том потоке, где пишет
+        self.failed = queue.SimpleQueue()  # пачки, которые не удалось записать, — назад в pending
+        self.recorded = 0
+        self.batches = 0
+        self.db = self.connect()
+
+    def connect(self):
+        if self.read_only:
+            if not os.path.exists(self.path):
+                db = sqlite3.connect(":memory:")
+                db.executescript(SCHEMA)
+                return db
+            return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(SCHEMA)
+        db.commit()
+        return db
+
+    def record(self, score, floors, goldens, misses, duration, skin, finished_at=None):
+        """Запомнить законченную партию (duration — секунды игрового времени)"""
+        if self.read_only:
+            return
+        if not self.pending:
+            self.pending_since = time.monotonic()
+        if finished_at is None:
+            finished_at = time.time()
+        self.pending.append((finished_at, score, floors, goldens, misses, duration, skin))
+        if len(self.pending) >= RUN_HISTORY_BATCH:
+            self.flush()
+
+    def tick(self):
+        """Вызывается каждый кадр: сбросить пачку, если она ждёт дольше RUN_HISTORY_FLUSH_INTERVAL"""
+        self.reclaim_failed()
+        if self.pending and time.monotonic() - self.pending_since >= RUN_HISTORY_FLUSH_INTERVAL:
+            self.flush()
+
+    def reclaim_failed(self):
+        """Вернуть в pending пачки, запись которых не удалась (повтор — со следующей пачкой)"""
+        while True:
+            try:
+                rows = self.failed.get_nowait()
+            except queue.Empty:
+                return
+            if not self.pending:
+                self.pending_since = time.monotonic()
+            self.pending[:0] = rows
+
+    def flush(self):
+        """Отдать накопленные партии на запись одной транзакцией"""
+        if not self.pending:
+            return False
+        rows, self.pending = self.pending, []
+        if self.worker:
+            self.worker.submit(self.write_rows, rows)
+        else:
+            self.write_rows(rows)
+        return True
+
+    def write_rows(self, rows):
+        try:
+            if self.writer is None:
+                self.writer = sqlite3.connect(self.path)
+            with self.writer:
+                self.writer.executemany(INSERT, rows)
+        except sqlite3.Error as e:
+            print(f"Error saving run history: {e}")
+            self.failed.put(rows)
+            return
+        self.recorded += len(rows)
+        self.batches += 1
+
+    def close_writer(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def close(self):
+        """Сбросить остаток и закрыть соединения (writer — в его потоке, после записи)"""
+        self.reclaim_failed()
+        self.flush()
+        if self.worker:
+            self.worker.submit(self.close_writer)
+        else:
+            self.close_writer()
+        self.db.close()
+
+    # запросы
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def top_runs(self, limit=10, skin=None):
+        """Лучшие партии по очкам (при равенстве — более ранняя выше)"""
+        columns = ", ".join(COLUMNS)
+        if skin is None:
+            rows = self.db.execute(
+                f"SELECT {columns} FROM runs "
+                "ORDER BY score DESC, id LIMIT ?", (limit,))
+        else:
+            rows = self.db.execute(
+                f"SELECT {columns} FROM runs "
+                "WHERE skin = ? ORDER BY score DESC, id LIMIT ?", (skin, limit))
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def skins(self):
+        """Скины, которыми играли: по одному поиску в индексе на скин, без полного прохода"""
+        skins = []
+        skin = self.db.execute("SELECT MIN(skin) FROM runs").fetchone()[0]
+        while skin is not None:
+            skins.append(skin)
+            skin = self.db.execute("SELECT MIN(skin) FROM runs WHERE skin > ?", (skin,)).fetchone()[0]
+        return skins
+
+    def skin_bests(self):
+        """{скин: лучшая партия этим скином}"""
+        return {skin: self.top_runs(1, skin)[0] for skin in self.skins()}
+
+    def rolling_average(self, window=10, count=50, column="score"):
+        """Скользящее среднее column по window партиям для последних count партий (от старых к новым)"""
+        if column not in ("score", "floors", "goldens", "misses", "duration"):
+            raise ValueError(f"unknown column: {column}")
+        rows = self.db.execute(
+            f"SELECT {column} FROM runs ORDER BY id DESC LIMIT ?", (count + window - 1,))
+        values = [row[0] for row in rows][::-1]
+
+        averages = []
+        total = 0
+        for i, value in enumerate(values):
+            total += value
+            if i >= window:
+                total -= values[i - window]
+            if i >= window - 1:
+                averages.append(total / window)
+        return averages
+
+    def get_stats(self):
+        return {"recorded": self.recorded, "batches": self.batches, "pending": len(self.pending)}
@@ -1,14 +1,34 @@
-"""Управление сохранением прогресса и настроек"""
+"""Управление сохранением прогресса и настроек.
+
+Изменения только помечают данные «грязными»; на диск они уходят через
+flush() — по таймеру (tick), при закрытии меню, Game Over и выходе.
+Файл пишется во временный и подменяется os.replace, поэтому сбой питания
+посреди записи не портит сохранение. С worker (PersistenceWorker) flush()
+только снимает копию данных, а json.dump и запись идут в фоновом потоке.
+"""
+import copy
 import json
 import os
-from config import TOWER_SKINS, DEFAULT_SETTINGS
+import threading
+import time
+from config import TOWER_SKINS, DEFAULT_SETTINGS, SAVE_FLUSH_INTERVAL
 
 
 class SaveManager:
-    def __init__(self, save_file="save_data.json"):
+    def __init__(self, save_file="save_data.json", read_only=False, worker=None):
         self.save_file = save_file
+        self.worker = worker  # без него flush() пишет сразу, в вызывающем потоке
+        # read_only — прогресс читается, но на диск не пишется (headless-прогоны)
+        self.read_only = read_only
         self.data = self.load_data()
 
+        self.dirty = False
+        self.dirty_since = 0.0  # когда появилось первое несохранённое изменение
+        self.changes = 0        # сколько раз данные менялись
+        self.writes = 0         # сколько раз файл реально записан
+        # запись не удалась (ставит фоновый поток); dirty трогает только главный — в tick()
+        self.write_failed = threading.Event()
+
     def load_data(self):
         if os.path.exists(self.save_file):
             try:
@@ -41,24 +61,69 @@ class SaveManager:
             "settings": DEFAULT_SETTINGS.copy(),
         }
 
-    def save_data(self):
+    def mark_dirty(self):
+        """Отметить изменение; запись на диск — позже, в flush()"""
+        self.changes += 1
+        if not self.dirty:
+            self.dirty = True
+            self.dirty_since = time.monotonic()
+
+    def tick(self):
+        """Вызывается каждый кадр: сбросить изменения, если они ждут дольше SAVE_FLUSH_INTERVAL"""
+        if self.write_failed.is_set():
+            # повторим через SAVE_FLUSH_INTERVAL, данные в памяти не потеряны
+            self.write_failed.clear()
+            if not self.dirty:
+                self.dirty = True
+                self.dirty_since = time.monotonic()
+        if self.dirty and time.monotonic() - self.dirty_since >= SAVE_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Отдать несохранённые изменения на запись; True, если запись поставлена"""
+        if not self.dirty or self.read_only:
+            return False
+        self.dirty = False
+        snapshot = copy.deepcopy(self.data)
+        if self.worker:
+            self.worker.submit(self.write_snapshot, snapshot)
+            return True
+        return self.write_snapshot(snapshot)
+
+    def write_snapshot(self, snapshot):
+        """Атомарная запись снимка (в фоновом потоке, если есть worker)"""
+        temp_file = self.save_file + ".tmp"
         try:
-            with open(self.save_file, "w") as f:
-                json.dump(self.data, f, indent=2)
+            with open(temp_file, "w") as f:
+                json.dump(snapshot, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.save_file)
         except Exception as e:
             print(f"Error saving data: {e}")
+            self.write_failed.set()
+            return False
+        self.writes += 1
+        return True
+
+    def get_stats(self):
+        return {
+            "changes": self.changes,
+            "writes": self.writes,
+            "writes_avoided": max(0, self.changes - self.writes),
+        }
 
     def get_coins(self):
         return self.data.get("coins", 0)
 
     def add_coins(self, amount):
         self.data["coins"] = self.get_coins() + amount
-        self.save_data()
+        self.mark_dirty()
 
     def spend_coins(self, amount):
         if self.get_coins() >= amount:
             self.data["coins"] = self.get_coins() - amount
-            self.save_data()
+            self.mark_dirty()
             return True
         return False
 
@@ -68,7 +133,7 @@ class SaveManager:
     def update_high_score(self, score):
         if score > self.get_high_score():
             self.data["high_score"] = score
-            self.save_data()
+            self.mark_dirty()
 
     def is_skin_unlocked(self, skin_id):
         return skin_id in self.data.get("unlocked_skins", [])
@@ -76,14 +141,14 @@ class SaveManager:
     def unlock_skin(self, skin_id):
         if skin_id not in self.data["unlocked_skins"]:
             self.data["unlocked_skins"].append(skin_id)
-            self.save_data()
+            self.mark_dirty()
 
     def get_selected_skin(self):
         return self.data.get("selected_skin", "tower_1")
 
     def set_selected_skin(self, skin_id):
         self.data["selected_skin"] = skin_id
-        self.save_data()
+        self.mark_dirty()
 
     # настройки — как было
     def get_settings(self):
@@ -96,18 +161,18 @@ class SaveManager:
 
     def set_music_volume(self, volume):
         self.data["settings"]["music_volume"] = max(0.0, min(1.0, volume))
-        self.save_data()
+        self.mark_dirty()
 
     def get_sound_volume(self):
         return self.get_settings().get("sound_volume", 0.7)
 
     def set_sound_volume(self, volume):
         self.data["settings"]["sound_volume"] = max(0.0, min(1.0, volume))
-        self.save_data()
+        self.mark_dirty()
 
     def get_selected_background(self):
         return self.get_settings().get("selected_background", 0)
 
     def set_selected_background(self, bg_index):
         self.data["settings"]["selected_background"] = bg_index
-        self.save_data()
+        self.mark_dirty()
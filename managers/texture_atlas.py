@@ -0,0 +1,46 @@
+"""Атлас текстур: мелкие спрайты упаковываются в несколько больших поверхностей"""
+import pygame
+from config import ATLAS_PAGE_WIDTH
+
+
+class TextureAtlas:
+    def __init__(self, page_width=ATLAS_PAGE_WIDTH, padding=1):
+        self.page_width = page_width
+        self.padding = padding
+        self.pages = []  # большие поверхности атласа
+
+    def pack(self, images):
+        """
+        Упаковать {имя: Surface} в новую страницу (полками по высоте)
+        и вернуть {имя: подповерхность страницы}.
+        """
+        if not images:
+            return {}
+
+        # высокие спрайты первыми — полки получаются плотнее
+        order = sorted(images, key=lambda name: images[name].get_height(), reverse=True)
+        placements = {}
+        x = y = shelf_height = 0
+        for name in order:
+            width, height = images[name].get_size()
+            if x and x + width > self.page_width:
+                x = 0
+                y += shelf_height + self.padding
+                shelf_height = 0
+            placements[name] = pygame.Rect(x, y, width, height)
+            x += width + self.padding
+            shelf_height = max(shelf_height, height)
+
+        page_width = max(rect.right for rect in placements.values())
+        page_height = y + shelf_height
+        page = pygame.Surface((page_width, page_height), pygame.SRCALPHA)
+        if pygame.display.get_surface():
+            page = page.convert_alpha()
+
+        # копируем пиксели как есть: прозрачность спрайта не смешивается с фоном страницы
+        for name, rect in placements.items():
+            page.blit(images[name], rect, special_flags=pygame.BLEND_RGBA_MAX)
+
+        self.pages.append(page)
+        return {name: page.subsurface(rect) for name, rect in placements.items()}
+
@@ -0,0 +1,59 @@
+"""
+Таблица рекордов и статистика по истории партий (run_history.db).
+
+Пример:
+    python run_stats.py --top 10 --skin tower_3 --window 20
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+
+from config import RUN_HISTORY_FILE
+from managers.run_history import RunHistory
+
+
+def format_run(place, run):
+    finished = datetime.fromtimestamp(run["finished_at"]).strftime("%Y-%m-%d %H:%M")
+    return (f"  {place:>3}. {run['score']:>5} pts  {run['floors']:>4} floors  "
+            f"{run['goldens']:>3} golden  {run['misses']} misses  "
+            f"{run['duration']:>6.1f}s  {run['skin']:<8} {finished}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Leaderboards from the run history")
+    parser.add_argument("--db", default=RUN_HISTORY_FILE)
+    parser.add_argument("--top", type=int, default=10, help="сколько лучших партий показать")
+    parser.add_argument("--skin", help="таблица рекордов только для этого скина")
+    parser.add_argument("--window", type=int, default=10, help="окно скользящего среднего")
+    parser.add_argument("--recent", type=int, default=20,
+                        help="для скольких последних партий считать скользящее среднее")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    history = RunHistory(args.db, read_only=True)
+    started = time.perf_counter()
+    total = history.count()
+    top = history.top_runs(args.top, args.skin)
+    bests = history.skin_bests()
+    rolling = history.rolling_average(args.window, args.recent)
+    elapsed = time.perf_counter() - started
+
+    print(f"Runs: {total}")
+    print(f"Top {args.top}" + (f" ({args.skin})" if args.skin else "") + ":")
+    for place, run in enumerate(top, 1):
+        print(format_run(place, run))
+    print("Best by skin:")
+    for skin, run in bests.items():
+        print(f"  {skin:<8} {run['score']:>5} pts")
+    if rolling:
+        print(f"Rolling average over {args.window} runs: "
+              + " ".join(f"{value:.1f}" for value in rolling))
+    print(f"Queries took {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
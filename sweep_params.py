@@ -0,0 +1,167 @@
+"""
+Перебор физических констант для настройки сложности.
+
+Для каждой комбинации GRAVITY / ROPE_LENGTH / INITIAL_FORCE / FORCE_MULTIPLIER
+играется пачка партий в core.batch_simulation (партии режутся на куски и
+раздаются пулу процессов), итоги пишутся в JSONL или CSV:
+высота башни (среднее и перцентили), доля золотых попаданий, доля промахов
+по этажам.
+
+Игрок моделируется случайной задержкой броска из [--delay-min, --delay-max]
+шагов для каждого блока.
+
+Пример:
+    python sweep_params.py --gravity 0.4:0.6:0.05 --force-multiplier 1.01,1.02,1.03 \\
+        --games 5000 --out sweep.jsonl
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from config import GRAVITY, ROPE_LENGTH, INITIAL_FORCE, FORCE_MULTIPLIER
+from core.batch_simulation import BatchSimulation
+
+PARAMS = ("gravity", "rope_length", "initial_force", "force_multiplier")
+PERCENTILES = (10, 50, 90)
+REPORT_FLOORS = 30  # сколько этажей выводить в поэтажной статистике
+POLICY_DROPS = 64   # задержек на партию, дальше по кругу
+
+
+def parse_grid(text):
+    """'0.4,0.5' — список значений; '0.4:0.6:0.05' — диапазон с шагом (включительно)"""
+    if ":" in text:
+        start, stop, step = (float(part) for part in text.split(":"))
+        count = int(round((stop - start) / step)) + 1
+        return [round(start + step * i, 10) for i in range(count)]
+    return [float(part) for part in text.split(",")]
+
+
+def run_chunk(task):
+    """Одна пачка партий для одной комбинации параметров (выполняется в процессе пула)"""
+    index, chunk, params, games, seed, delay_min, delay_max, max_steps = task
+    rng = np.random.default_rng(seed)
+    delays = rng.integers(delay_min, delay_max + 1, size=(games, POLICY_DROPS))
+    sim = BatchSimulation(games, floor_bins=REPORT_FLOORS, **params).run(delays, max_steps)
+    return index, {
+        "max_size": sim.max_size,
+        "score": sim.score,
+        "builds": int(sim.builds.sum()),
+        "goldens": int(sim.goldens.sum()),
+        "drops": int(sim.drops.sum()),
+        "unfinished": int((~sim.gameover).sum()),
+        "floor_drops": sim.floor_drops,
+        "floor_losses": sim.floor_losses,
+    }
+
+
+def summarize(params, chunks):
+    heights = np.concatenate([chunk["max_size"] for chunk in chunks])
+    scores = np.concatenate([chunk["score"] for chunk in chunks])
+    builds = sum(chunk["builds"] for chunk in chunks)
+    goldens = sum(chunk["goldens"] for chunk in chunks)
+    drops = sum(chunk["drops"] for chunk in chunks)
+    floor_drops = sum(chunk["floor_drops"] for chunk in chunks)
+    floor_losses = sum(chunk["floor_losses"] for chunk in chunks)
+
+    row = dict(params)
+    row["games"] = len(heights)
+    row["unfinished"] = sum(chunk["unfinished"] for chunk in chunks)
+    row["mean_height"] = float(heights.mean())
+    for q, value in zip(PERCENTILES, np.percentile(heights, PERCENTILES)):
+        row[f"p{q}_height"] = float(value)
+    row["mean_score"] = float(scores.mean())
+    row["golden_rate"] = goldens / builds if builds else 0.0
+    row["miss_rate"] = float(floor_losses.sum() / drops) if drops else 0.0
+    # None — на этот этаж никто не бросал
+    row["miss_rate_by_floor"] = [
+        float(losses / tries) if tries else None
+        for tries, losses in zip(floor_drops, floor_losses)
+    ]
+    return row
+
+
+def write_jsonl(path, rows):
+    with open(path, "w") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+def write_csv(path, rows):
+    fields = [key for key in rows[0] if key != "miss_rate_by_floor"]
+    fields += [f"miss_rate_floor_{i}" for i in range(REPORT_FLOORS)]
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            flat = {key: value for key, value in row.items() if key != "miss_rate_by_floor"}
+            for i, rate in enumerate(row["miss_rate_by_floor"]):
+                flat[f"miss_rate_floor_{i}"] = "" if rate is None else rate
+            writer.writerow(flat)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Parameter sweep for difficulty tuning")
+    parser.add_argument("--gravity", default=str(GRAVITY))
+    parser.add_argument("--rope-length", default=str(ROPE_LENGTH))
+    parser.add_argument("--initial-force", default=str(INITIAL_FORCE))
+    parser.add_argument("--force-multiplier", default=str(FORCE_MULTIPLIER))
+    parser.add_argument("--games", type=int, default=2000, help="партий на комбинацию")
+    parser.add_argument("--chunk", type=int, default=1000, help="партий в одной задаче пула")
+    parser.add_argument("--delay-min", type=int, default=0)
+    parser.add_argument("--delay-max", type=int, default=120)
+    parser.add_argument("--max-steps", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="sweep.jsonl")
+    parser.add_argument("--format", choices=("jsonl", "csv"),
+                        help="по умолчанию — по расширению --out")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    grids = [parse_grid(getattr(args, name)) for name in PARAMS]
+    combos = [dict(zip(PARAMS, values)) for values in itertools.product(*grids)]
+
+    # каждая комбинация режется на куски по --chunk партий, у куска свой seed
+    seeds = np.random.SeedSequence(args.seed)
+    tasks = []
+    for index, params in enumerate(combos):
+        for start in range(0, args.games, args.chunk):
+            games = min(args.chunk, args.games - start)
+            seed = seeds.spawn(1)[0].generate_state(1)[0]
+            tasks.append((index, start, params, games, seed,
+                          args.delay_min, args.delay_max, args.max_steps))
+
+    print(f"Sweep: {len(combos)} combinations x {args.games} games, "
+          f"{len(tasks)} tasks on {args.workers} workers")
+    started = time.perf_counter()
+    chunks = [[] for _ in combos]
+    with Pool(args.workers) as pool:
+        for done, (index, result) in enumerate(pool.imap_unordered(run_chunk, tasks), 1):
+            chunks[index].append(result)
+            print(f"\r  {done}/{len(tasks)} tasks", end="", flush=True)
+    elapsed = time.perf_counter() - started
+    print()
+
+    rows = [summarize(params, chunks[index]) for index, params in enumerate(combos)]
+    fmt = args.format or ("csv" if args.out.endswith(".csv") else "jsonl")
+    if fmt == "csv":
+        write_csv(args.out, rows)
+    else:
+        write_jsonl(args.out, rows)
+
+    total = len(combos) * args.games
+    print(f"Done: {total} games in {elapsed:.1f}s ({total / elapsed:.0f} games/s) -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
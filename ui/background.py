@@ -0,0 +1,76 @@
+"""Кэш слоёв фона: облака сверху и основная часть, заранее нарезанные в полосы"""
+import pygame
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+class Background:
+    def __init__(self, resource_manager, save_manager):
+        self.resource_manager = resource_manager
+        self.save_manager = save_manager
+        self.layers = {}  # индекс фона -> (main_strip, clouds_strip, clouds_height)
+
+    def build_layers(self, index):
+        """Один раз режем bgN на облака и основную часть и раскладываем их в полосы"""
+        bg_image = self.resource_manager.get_image(f"bg{index + 1}")
+        if not bg_image:
+            return None
+
+        width = min(bg_image.get_width(), SCREEN_WIDTH)
+        bg_height = bg_image.get_height()
+        clouds_height = int(bg_height * 0.08)
+        main_height = bg_height - clouds_height
+
+        # основная часть, уложенная сверху вниз на весь экран
+        main_strip = pygame.Surface((width, SCREEN_HEIGHT), pygame.SRCALPHA)
+        y_pos = 0
+        while y_pos < SCREEN_HEIGHT:
+            main_strip.blit(
+                bg_image, (0, y_pos), (0, clouds_height, width, main_height)
+            )
+            y_pos += main_height
+
+        # облака на экран плюс ещё одна полоса — под любой сдвиг
+        clouds_strip = None
+        if clouds_height > 0:
+            clouds_strip = pygame.Surface(
+                (width, SCREEN_HEIGHT + clouds_height), pygame.SRCALPHA
+            )
+            y_pos = 0
+            while y_pos < SCREEN_HEIGHT + clouds_height:
+                clouds_strip.blit(bg_image, (0, y_pos), (0, 0, width, clouds_height))
+                y_pos += clouds_height
+            clouds_strip = clouds_strip.convert_alpha()
+
+        layers = (main_strip.convert_alpha(), clouds_strip, clouds_height)
+        self.layers[index] = layers
+        return layers
+
+    def get_layers(self, index):
+        if index in self.layers:
+            return self.layers[index]
+        return self.build_layers(index)
+
+    def draw(self, screen, camera):
+        """Фон со сдвигом камеры — не больше двух blit'ов, только видимые полосы"""
+        screenY = camera.render_y
+        layers = self.get_layers(self.save_manager.get_selected_background())
+        if not layers:
+            screen.fill((135, 206, 235))
+            return
+
+        main_strip, clouds_strip, clouds_height = layers
+
+        if screenY < SCREEN_HEIGHT:
+            screen.blit(
+                main_strip,
+                (0, screenY),
+                (0, 0, main_strip.get_width(), SCREEN_HEIGHT - screenY),
+            )
+
+        if screenY > 0 and clouds_strip:
+            offset = -screenY % clouds_height
+            screen.blit(
+                clouds_strip,
+                (0, 0),
+                (0, offset, clouds_strip.get_width(), min(screenY, SCREEN_HEIGHT)),
+            )
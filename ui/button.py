@@ -1,5 +1,6 @@
 """Класс кнопки для UI"""
 import pygame
+from managers.font_manager import fonts
 
 class Button:
     def __init__(self, x, y, width, height, text, font, 
@@ -19,7 +20,7 @@ class Button:
         pygame.draw.rect(screen, color, self.rect, border_radius=10)
         pygame.draw.rect(screen, (0, 0, 0), self.rect, 2, border_radius=10)
         
-        text_surface = self.font.render(self.text, True, self.text_color)
+        text_surface = fonts.render(self.font, self.text, True, self.text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
     
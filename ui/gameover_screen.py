@@ -1,5 +1,6 @@
 """Экран Game Over"""
 import pygame
+from managers.font_manager import fonts
 
 class GameOverScreen:
     def __init__(self, over_font, score_font, mini_font, background):
@@ -12,9 +13,9 @@ class GameOverScreen:
     def show(self, screen, score):
         pygame.time.set_timer(self.blink_event, 800)
         
-        over_text = self.over_font.render("GAME OVER", True, (0, 0, 0))
-        high_score = self.score_font.render(f"SCORE: {score}", True, (0, 0, 0))
-        button = self.mini_font.render("PRESS ANY BUTTON TO RESTART", True, (0, 0, 0))
+        over_text = fonts.render(self.over_font, "GAME OVER", True, (0, 0, 0))
+        high_score = fonts.render(self.score_font, f"SCORE: {score}", True, (0, 0, 0))
+        button = fonts.render(self.mini_font, "PRESS ANY BUTTON TO RESTART", True, (0, 0, 0))
         
         blank_rect = button.get_rect()
         blank = pygame.Surface((blank_rect.size), pygame.SRCALPHA)
@@ -1,33 +1,71 @@
 """Интерфейс HUD с монетами и жизнями"""
 import pygame
 from config import GOLD, RED
+from managers.font_manager import fonts
 
 class HUD:
-    def __init__(self, font):
+    def __init__(self, font, x=10, y=10):
         self.font = font
-        self.small_font = pygame.font.Font("freesansbold.ttf", 20)
-        
-    def show_score(self, screen, score, x=10, y=10):
-        score_text = self.font.render(f"Score: {score}", True, (0, 0, 0))
-        screen.blit(score_text, (x, y))
-    
-    def show_coins(self, screen, coins, x=10, y=50):
-        coins_text = self.small_font.render(f"Coins: {coins}", True, GOLD)
-        screen.blit(coins_text, (x, y))
-    
-    def show_lives(self, screen, lives, x=10, y=75):
-        """Отображение жизней"""
-        lives_text = self.small_font.render(f"Lives: {lives}", True, RED)
-        screen.blit(lives_text, (x, y))
-        
-        # Рисуем сердечки
+        self.small_font = fonts.get_font(20)
+        self.x = x
+        self.y = y
+
+        # Готовый слой HUD: пересобирается только при смене значений
+        self.heart = self.create_heart()
+        self.layer = None
+        self.layer_rect = pygame.Rect(x, y, 0, 0)
+        self.layer_key = None
+
+    def create_heart(self):
+        """Простое сердечко из кругов, нарисованное один раз"""
+        heart = pygame.Surface((28, 24), pygame.SRCALPHA)
+        pygame.draw.circle(heart, RED, (8, 8), 8)
+        pygame.draw.circle(heart, RED, (18, 8), 8)
+        pygame.draw.polygon(heart, RED, [(0, 8), (26, 8), (13, 21)])
+        return heart
+
+    def get_rect(self, score, coins, lives):
+        """Область экрана, которую занимает слой HUD"""
+        self.update(score, coins, lives)
+        return self.layer_rect
+
+    def update(self, score, coins, lives):
+        if (score, coins, lives) != self.layer_key:
+            self.build_layer(score, coins, lives)
+
+    def build_layer(self, score, coins, lives):
+        x, y = self.x, self.y
+        score_text = fonts.render(self.font, f"Score: {score}", True, (0, 0, 0))
+        coins_text = fonts.render(self.small_font, f"Coins: {coins}", True, GOLD)
+        lives_text = fonts.render(self.small_font, f"Lives: {lives}", True, RED)
+
+        # (поверхность, позиция на экране)
+        parts = [
+            (score_text, (x, y)),
+            (coins_text, (x, y + 40)),
+            (lives_text, (x, y + 65)),
+        ]
         heart_x = x + 70
         for i in range(lives):
-            # Простое сердечко из кругов
-            pygame.draw.circle(screen, RED, (heart_x + i*25, y + 5), 8)
-            pygame.draw.circle(screen, RED, (heart_x + i*25 + 10, y + 5), 8)
-            pygame.draw.polygon(screen, RED, [
-                (heart_x + i*25 - 8, y + 5),
-                (heart_x + i*25 + 18, y + 5),
-                (heart_x + i*25 + 5, y + 18)
-            ])
+            parts.append((self.heart, (heart_x + i * 25 - 8, y + 62)))
+
+        rect = pygame.Rect(x, y, 0, 0)
+        for surf, pos in parts:
+            rect.union_ip(surf.get_rect(topleft=pos))
+
+        # BLEND_RGBA_MAX переносит пиксели на прозрачный слой без
+        # повторного смешивания, поэтому слой выглядит как прямой вывод
+        layer = pygame.Surface(rect.size, pygame.SRCALPHA)
+        for surf, pos in parts:
+            layer.blit(
+                surf, (pos[0] - rect.x, pos[1] - rect.y),
+                special_flags=pygame.BLEND_RGBA_MAX,
+            )
+
+        self.layer = layer
+        self.layer_rect = rect
+        self.layer_key = (score, coins, lives)
+
+    def draw(self, screen, score, coins, lives):
+        self.update(score, coins, lives)
+        screen.blit(self.layer, self.layer_rect)
@@ -2,6 +2,7 @@
 import pygame
 from config import *
 from ui.button import Button
+from managers.font_manager import fonts
 
 class SettingsMenu:
     def __init__(self, save_manager, audio_manager):
@@ -9,9 +10,9 @@ class SettingsMenu:
         self.audio_manager = audio_manager
         
         # Шрифты
-        self.title_font = pygame.font.Font("freesansbold.ttf", 48)
-        self.font = pygame.font.Font("freesansbold.ttf", 24)
-        self.small_font = pygame.font.Font("freesansbold.ttf", 18)
+        self.title_font = fonts.get_font(48)
+        self.font = fonts.get_font(24)
+        self.small_font = fonts.get_font(18)
         
         # Кнопка закрытия
         self.close_button = Button(650, 20, 130, 40, "Close", self.font,
@@ -21,6 +22,11 @@ class SettingsMenu:
         self.background = pygame.Surface((700, 500))
         self.background.fill((40, 40, 60))
         pygame.draw.rect(self.background, (100, 100, 150), (0, 0, 700, 500), 3)
+
+        # Затемнение создаётся один раз, а не каждый кадр
+        self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.overlay.set_alpha(200)
+        self.overlay.fill((0, 0, 0))
         
         # Позиции меню
         self.menu_x = (SCREEN_WIDTH - 700) // 2
@@ -46,12 +52,20 @@ class SettingsMenu:
                         BACKGROUND_NAMES[i], self.small_font,
                         color=(80, 80, 120), hover_color=(120, 120, 180))
             self.bg_buttons.append(btn)
+        
+        # Кнопка закрытия — в правом верхнем углу панели
+        self.close_button.rect.x = self.menu_x + 550
+        self.close_button.rect.y = self.menu_y + 20
+        
+        # Слои рисуются в экранных координатах на холсты размером с экран,
+        # а на экран уходит только прямоугольник панели
+        self.panel_rect = pygame.Rect(self.menu_x, self.menu_y, 700, 500)
+        self.static_layer = self.build_static_layer()
+        self.layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.layer_key = None
     
     def handle_event(self, event, mouse_pos):
         """Обработка событий"""
-        # Обновляем позицию кнопки закрытия
-        self.close_button.rect.x = self.menu_x + 550
-        self.close_button.rect.y = self.menu_y + 20
         self.close_button.update(mouse_pos)
         
         # Кнопка закрытия
@@ -110,80 +124,91 @@ class SettingsMenu:
         
         return None
     
-    def draw(self, screen):
-        """Отрисовка меню настроек"""
-        # Затемнение фона
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill((0, 0, 0))
-        screen.blit(overlay, (0, 0))
-        
-        # Фон меню
-        screen.blit(self.background, (self.menu_x, self.menu_y))
+    def darken(self, surface):
+        """Затемнить кадр игры под меню (делается один раз при открытии)"""
+        surface.blit(self.overlay, (0, 0))
+    
+    def build_static_layer(self):
+        """Неизменная часть панели: фон, заголовок, подписи, дорожки слайдеров"""
+        layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        layer.blit(self.background, (self.menu_x, self.menu_y))
         
         # Заголовок
-        title = self.title_font.render("SETTINGS", True, (255, 255, 255))
-        screen.blit(title, (self.menu_x + 220, self.menu_y + 20))
+        title = fonts.render(self.title_font, "SETTINGS", True, (255, 255, 255))
+        layer.blit(title, (self.menu_x + 220, self.menu_y + 20))
         
         # === МУЗЫКА ===
-        music_label = self.font.render("Music Volume:", True, (255, 255, 255))
-        screen.blit(music_label, (self.menu_x + 50, self.menu_y + 145))
-        
-        # Слайдер музыки
-        pygame.draw.rect(screen, (100, 100, 100), 
+        music_label = fonts.render(self.font, "Music Volume:", True, (255, 255, 255))
+        layer.blit(music_label, (self.menu_x + 50, self.menu_y + 145))
+        pygame.draw.rect(layer, (100, 100, 100), 
                         (self.music_slider_x, self.music_slider_y, 
                          self.music_slider_width, 20))
         
+        # === ЗВУКИ ===
+        sound_label = fonts.render(self.font, "Sound Volume:", True, (255, 255, 255))
+        layer.blit(sound_label, (self.menu_x + 50, self.menu_y + 215))
+        pygame.draw.rect(layer, (100, 100, 100), 
+                        (self.sound_slider_x, self.sound_slider_y, 
+                         self.sound_slider_width, 20))
+        
+        # === ВЫБОР ФОНА ===
+        bg_label = fonts.render(self.font, "Background:", True, (255, 255, 255))
+        layer.blit(bg_label, (self.menu_x + 50, self.menu_y + 285))
+        
+        return layer
+    
+    def get_layer_key(self):
+        """Всё, от чего зависит изменяемая часть меню"""
+        return (
+            self.save_manager.get_music_volume(),
+            self.save_manager.get_sound_volume(),
+            self.save_manager.get_selected_background(),
+            tuple(btn.is_hovered for btn in self.bg_buttons),
+            self.close_button.is_hovered,
+        )
+    
+    def build_layer(self):
+        """Статичный слой плюс слайдеры, проценты и кнопки"""
+        layer = self.layer
+        layer.blit(self.static_layer, self.panel_rect.topleft, self.panel_rect)
+        
         music_volume = self.save_manager.get_music_volume()
         
         # Заполнение слайдера
         fill_width = int(music_volume * self.music_slider_width)
         if fill_width > 0:
-            pygame.draw.rect(screen, (0, 200, 0), 
+            pygame.draw.rect(layer, (0, 200, 0), 
                            (self.music_slider_x, self.music_slider_y, 
                             fill_width, 20))
         
         # Ручка слайдера
         handle_x = self.music_slider_x + int(music_volume * self.music_slider_width)
-        pygame.draw.circle(screen, (255, 255, 0), (handle_x, self.music_slider_y + 10), 12)
-        pygame.draw.circle(screen, (200, 200, 0), (handle_x, self.music_slider_y + 10), 10)
+        pygame.draw.circle(layer, (255, 255, 0), (handle_x, self.music_slider_y + 10), 12)
+        pygame.draw.circle(layer, (200, 200, 0), (handle_x, self.music_slider_y + 10), 10)
         
         # Процент
-        percent_text = self.font.render(f"{int(music_volume * 100)}%", True, (255, 255, 255))
-        screen.blit(percent_text, (self.music_slider_x + self.music_slider_width + 20, 
-                                   self.music_slider_y - 5))
-        
-        # === ЗВУКИ ===
-        sound_label = self.font.render("Sound Volume:", True, (255, 255, 255))
-        screen.blit(sound_label, (self.menu_x + 50, self.menu_y + 215))
-        
-        # Слайдер звуков
-        pygame.draw.rect(screen, (100, 100, 100), 
-                        (self.sound_slider_x, self.sound_slider_y, 
-                         self.sound_slider_width, 20))
+        percent_text = fonts.render(self.font, f"{int(music_volume * 100)}%", True, (255, 255, 255))
+        layer.blit(percent_text, (self.music_slider_x + self.music_slider_width + 20, 
+                                  self.music_slider_y - 5))
         
         sound_volume = self.save_manager.get_sound_volume()
         
         # Заполнение слайдера
         fill_width2 = int(sound_volume * self.sound_slider_width)
         if fill_width2 > 0:
-            pygame.draw.rect(screen, (0, 200, 200), 
+            pygame.draw.rect(layer, (0, 200, 200), 
                            (self.sound_slider_x, self.sound_slider_y, 
                             fill_width2, 20))
         
         # Ручка слайдера
         handle_x2 = self.sound_slider_x + int(sound_volume * self.sound_slider_width)
-        pygame.draw.circle(screen, (0, 255, 255), (handle_x2, self.sound_slider_y + 10), 12)
-        pygame.draw.circle(screen, (0, 200, 200), (handle_x2, self.sound_slider_y + 10), 10)
+        pygame.draw.circle(layer, (0, 255, 255), (handle_x2, self.sound_slider_y + 10), 12)
+        pygame.draw.circle(layer, (0, 200, 200), (handle_x2, self.sound_slider_y + 10), 10)
         
         # Процент
-        percent_text2 = self.font.render(f"{int(sound_volume * 100)}%", True, (255, 255, 255))
-        screen.blit(percent_text2, (self.sound_slider_x + self.sound_slider_width + 20, 
-                                    self.sound_slider_y - 5))
-        
-        # === ВЫБОР ФОНА ===
-        bg_label = self.font.render("Background:", True, (255, 255, 255))
-        screen.blit(bg_label, (self.menu_x + 50, self.menu_y + 285))
+        percent_text2 = fonts.render(self.font, f"{int(sound_volume * 100)}%", True, (255, 255, 255))
+        layer.blit(percent_text2, (self.sound_slider_x + self.sound_slider_width + 20, 
+                                   self.sound_slider_y - 5))
         
         selected_bg = self.save_manager.get_selected_background()
         
@@ -196,7 +221,20 @@ class SettingsMenu:
                 btn.color = (80, 80, 120)
                 btn.hover_color = (120, 120, 180)
             
-            btn.draw(screen)
+            btn.draw(layer)
         
         # Кнопка закрытия
-        self.close_button.draw(screen)
+        self.close_button.draw(layer)
+        
+        self.layer_key = self.get_layer_key()
+    
+    def get_render_layers(self):
+        """Слои для DirtyRenderer: вся изменяемая часть меню — внутри панели"""
+        return [("settings_panel", self.get_layer_key(), self.panel_rect)]
+    
+    def draw(self, screen):
+        """Отрисовка меню настроек поверх уже затемнённого кадра"""
+        # в покое это один blit готовой панели
+        if self.get_layer_key() != self.layer_key:
+            self.build_layer()
+        screen.blit(self.layer, self.panel_rect.topleft, self.panel_rect)
@@ -2,18 +2,27 @@
 import pygame
 from config import *
 from ui.button import Button
+from managers.font_manager import fonts
 
 
 class ShopMenu:
     def __init__(self, save_manager, resource_manager):
         self.save_manager = save_manager
         self.resource_manager = resource_manager
-        self.font = pygame.font.Font("freesansbold.ttf", 24)
-        self.title_font = pygame.font.Font("freesansbold.ttf", 48)
-        self.small_font = pygame.font.Font("freesansbold.ttf", 16)
+        self.font = fonts.get_font(24)
+        self.title_font = fonts.get_font(48)
+        self.small_font = fonts.get_font(16)
 
         self.close_button = Button(650, 20, 130, 50, "Close", self.font)
 
+        # Затемнение создаётся один раз, а не каждый кадр
+        self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.overlay.set_alpha(200)
+        self.overlay.fill((50, 50, 50))
+
+        # Готовые карточки скинов пересобираются только при смене монет/скинов
+        self.previews = {}
+        self.state_key = None
         self.skin_buttons = {}
         self.create_skin_buttons()
 
@@ -31,111 +40,165 @@ class ShopMenu:
             x = x_start + col * (button_width + spacing)
             y = y_start + row * (button_height + spacing)
 
+            rect = pygame.Rect(x, y, button_width, button_height)
             self.skin_buttons[skin_id] = {
-                "rect": pygame.Rect(x, y, button_width, button_height),
+                "rect": rect,
                 "data": skin_data,
+                "action_rect": pygame.Rect(rect.x + 20, rect.y + 140, 110, 30),
+                "action_hovered": False,
+                "state": None,     # (открыт, выбран, хватает монет)
+                "surfaces": None,  # (обычная карточка, карточка с подсветкой кнопки)
+                "pos": rect.topleft,
             }
 
-    def draw(self, screen):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill((50, 50, 50))
-        screen.blit(overlay, (0, 0))
-
-        title = self.title_font.render("SHOP", True, GOLD)
-        screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 20))
-
-        coins_text = self.font.render(
-            f"Coins: {self.save_manager.get_coins()}", True, GOLD
-        )
-        screen.blit(coins_text, (50, 30))
-
+    def get_preview(self, skin_id):
+        """Превью скина масштабируется один раз — с сохранением пропорций, в квадрат 60x60"""
+        if skin_id not in self.previews:
+            preview = None
+            parts = self.resource_manager.tower_sprites.get(skin_id)
+            if parts and parts.get("middle_list"):
+                sprite = parts["middle_list"][0]
+                width, height = sprite.get_size()
+                scale = min(60 / width, 60 / height)
+                size = (max(1, round(width * scale)), max(1, round(height * scale)))
+                preview = pygame.transform.smoothscale(sprite, size)
+            self.previews[skin_id] = preview
+        return self.previews[skin_id]
+
+    def refresh(self):
+        """Пересобрать карточки, если изменились монеты, открытые скины или выбор"""
+        coins = self.save_manager.get_coins()
         selected_skin = self.save_manager.get_selected_skin()
+        unlocked = tuple(self.save_manager.data.get("unlocked_skins", []))
+        key = (coins, unlocked, selected_skin)
+        if key == self.state_key:
+            return
+        self.state_key = key
 
         for skin_id, button_data in self.skin_buttons.items():
-            rect = button_data["rect"]
-            data = button_data["data"]
-            is_unlocked = self.save_manager.is_skin_unlocked(skin_id)
-            is_selected = skin_id == selected_skin
+            is_unlocked = skin_id in unlocked
+            state = (
+                is_unlocked,
+                skin_id == selected_skin,
+                coins >= button_data["data"]["price"],
+            )
+            if state != button_data["state"]:
+                button_data["state"] = state
+                button_data["surfaces"], button_data["pos"] = self.build_card(
+                    skin_id, state
+                )
+
+    def build_card(self, skin_id, state):
+        """Рамка, превью, имя, статус и кнопка в двух вариантах подсветки"""
+        button_data = self.skin_buttons[skin_id]
+        rect = button_data["rect"]
+        data = button_data["data"]
+        is_unlocked, is_selected, can_afford = state
+
+        if is_selected:
+            color = GREEN
+            thickness = 5
+        elif is_unlocked:
+            color = WHITE
+            thickness = 3
+        else:
+            color = GRAY
+            thickness = 2
 
+        name_text = fonts.render(self.font, data["name"], True, WHITE)
+        if is_unlocked:
             if is_selected:
-                color = GREEN
-                thickness = 5
-            elif is_unlocked:
-                color = WHITE
-                thickness = 3
+                status_text = fonts.render(self.small_font, "SELECTED", True, GREEN)
             else:
-                color = GRAY
-                thickness = 2
-
-            pygame.draw.rect(screen, color, rect, thickness, border_radius=10)
-
-            # превью: берём middle у текущего скина
-            if hasattr(self.resource_manager, "tower_sprites") and skin_id in self.resource_manager.tower_sprites:
-                parts = self.resource_manager.tower_sprites[skin_id]
-                preview = parts.get("middle")
-                if preview:
-                    preview_scaled = pygame.transform.scale(preview, (60, 60))
-                    screen.blit(preview_scaled, (rect.x + 45, rect.y + 10))
-
-            name_text = self.font.render(data["name"], True, WHITE)
-            screen.blit(
-                name_text,
-                (
-                    rect.x + rect.width // 2 - name_text.get_width() // 2,
-                    rect.y + 80,
-                ),
+                status_text = fonts.render(self.small_font, "Owned", True, WHITE)
+        else:
+            price_text = f"{data['price']} coins"
+            status_text = fonts.render(self.small_font, price_text, True, GOLD)
+
+        name_pos = (rect.x + rect.width // 2 - name_text.get_width() // 2, rect.y + 80)
+        status_pos = (rect.x + rect.width // 2 - status_text.get_width() // 2, rect.y + 110)
+
+        # имя скина бывает шире карточки — поверхность берём по общим границам
+        bounds = rect.union(name_text.get_rect(topleft=name_pos))
+        bounds.union_ip(status_text.get_rect(topleft=status_pos))
+
+        def local(pos):
+            return (pos[0] - bounds.x, pos[1] - bounds.y)
+
+        action_rect = button_data["action_rect"].move(-bounds.x, -bounds.y)
+        action_button = None
+        if is_unlocked and not is_selected:
+            action_button = Button(
+                *action_rect, "Select", self.small_font,
+                color=GREEN, hover_color=(0, 255, 0),
+            )
+        elif not is_unlocked:
+            action_button = Button(
+                *action_rect, "Buy", self.small_font,
+                color=GREEN if can_afford else GRAY,
+                hover_color=(0, 255, 0) if can_afford else GRAY,
             )
 
-            if is_unlocked:
-                if is_selected:
-                    status_text = self.small_font.render("SELECTED", True, GREEN)
-                else:
-                    status_text = self.small_font.render("Owned", True, WHITE)
-            else:
-                price_text = f"{data['price']} coins"
-                status_text = self.small_font.render(price_text, True, GOLD)
-
-            screen.blit(
-                status_text,
-                (
-                    rect.x + rect.width // 2 - status_text.get_width() // 2,
-                    rect.y + 110,
-                ),
+        surfaces = []
+        for hovered in (False, True):
+            card = pygame.Surface(bounds.size, pygame.SRCALPHA)
+            pygame.draw.rect(
+                card, color, rect.move(-bounds.x, -bounds.y), thickness, border_radius=10
             )
+            preview = self.get_preview(skin_id)
+            if preview:
+                # по центру квадрата 60x60 на месте превью
+                card.blit(preview, local(preview.get_rect(center=(rect.x + 75, rect.y + 40)).topleft))
+            card.blit(name_text, local(name_pos))
+            card.blit(status_text, local(status_pos))
+            if action_button:
+                action_button.is_hovered = hovered
+                action_button.draw(card)
+            surfaces.append(card)
+
+        return tuple(surfaces), bounds.topleft
+
+    def darken(self, surface):
+        """Затемнить кадр игры под магазином (делается один раз при открытии)"""
+        surface.blit(self.overlay, (0, 0))
 
-            button_y = rect.y + 140
-            if is_unlocked and not is_selected:
-                action_button = Button(
-                    rect.x + 20,
-                    button_y,
-                    110,
-                    30,
-                    "Select",
-                    self.small_font,
-                    color=GREEN,
-                    hover_color=(0, 255, 0),
-                )
-                action_button.draw(screen)
-            elif not is_unlocked:
-                can_afford = self.save_manager.get_coins() >= data["price"]
-                color = GREEN if can_afford else GRAY
-                action_button = Button(
-                    rect.x + 20,
-                    button_y,
-                    110,
-                    30,
-                    "Buy",
-                    self.small_font,
-                    color=color,
-                    hover_color=(0, 255, 0) if can_afford else GRAY,
-                )
-                action_button.draw(screen)
+    def draw(self, screen):
+        """Магазин поверх уже затемнённого кадра"""
+        self.refresh()
+
+        title = fonts.render(self.title_font, "SHOP", True, GOLD)
+        screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 20))
+
+        coins_text = fonts.render(
+            self.font, f"Coins: {self.save_manager.get_coins()}", True, GOLD
+        )
+        screen.blit(coins_text, (50, 30))
+
+        for button_data in self.skin_buttons.values():
+            normal, hovered = button_data["surfaces"]
+            card = hovered if button_data["action_hovered"] else normal
+            screen.blit(card, button_data["pos"])
 
         self.close_button.draw(screen)
 
+    def get_render_layers(self):
+        """Слои для DirtyRenderer: строка монет, карточки и кнопка закрытия"""
+        self.refresh()
+        coins = self.save_manager.get_coins()
+        coins_text = fonts.render(self.font, f"Coins: {coins}", True, GOLD)
+        layers = [("shop_coins", coins, coins_text.get_rect(topleft=(50, 30)))]
+        for skin_id, button_data in self.skin_buttons.items():
+            card = button_data["surfaces"][0].get_rect(topleft=button_data["pos"])
+            layers.append((
+                f"shop_{skin_id}", (button_data["state"], button_data["action_hovered"]), card,
+            ))
+        layers.append(("shop_close", self.close_button.is_hovered, self.close_button.rect.inflate(2, 2)))
+        return layers
+
     def handle_event(self, event, mouse_pos):
         self.close_button.update(mouse_pos)
+        for button_data in self.skin_buttons.values():
+            button_data["action_hovered"] = button_data["action_rect"].collidepoint(mouse_pos)
 
         if self.close_button.is_clicked(event):
             return "close"
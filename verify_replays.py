@@ -0,0 +1,126 @@
+"""
+Проверка присланных результатов по записям ввода.
+
+Каждая запись (JSONL из main.py --record) заново проигрывается на
+core.simulation без окна и сравнивается с заявленными в ней Game Over:
+кадр и очки каждой партии должны совпасть. Запись без версии правил или
+с другой версией (RULES_VERSION) отклоняется: поле "rules" пишет сам
+отправитель, верить ему нельзя. Старые записи, принятые до смены правил,
+можно пропустить только списком на стороне сервера (--legacy-list):
+они считаются устаревшими, а не отклонёнными. Длину сессии тоже задаёт
+отправитель, поэтому записи длиннее --max-frames отклоняются до проигрывания.
+Файлы раздаются пулу процессов, в конце — сводка и скорость в записях в секунду.
+
+Пример:
+    python verify_replays.py submissions/ --workers 8 --out verdicts.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from functools import partial
+from multiprocessing import Pool
+
+from config import SIMULATION_RATE
+from core.input_script import InputScript
+from core.replay import replay_gameovers, recorded_gameovers
+from core.simulation import RULES_VERSION
+
+MAX_FRAMES = SIMULATION_RATE * 60 * 60 * 2  # по умолчанию — два часа игры
+
+
+def verify(path, legacy=frozenset(), max_frames=MAX_FRAMES):
+    """Вердикт по одной записи (выполняется в процессе пула); legacy — имена старых файлов"""
+    try:
+        script = InputScript.load(path)
+        if not script.compatible():
+            if os.path.basename(path) in legacy:
+                return {"file": path, "valid": None, "rules": script.rules}
+            return {"file": path, "valid": False,
+                    "error": f"rules {script.rules or 'missing'}, current rules {RULES_VERSION}"}
+        frames = script.end_frame()
+        if not 0 <= frames <= max_frames:
+            return {"file": path, "valid": False,
+                    "error": f"{frames} frames, limit is {max_frames}"}
+        claimed = recorded_gameovers(script)
+        actual = replay_gameovers(script)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        return {"file": path, "valid": False, "error": f"{type(e).__name__}: {e}"}
+
+    return {
+        "file": path,
+        "valid": claimed == actual,
+        "claimed_best": max((score for _, score in claimed), default=0),
+        "actual_best": max((score for _, score in actual), default=0),
+        "games": len(actual),
+        "frames": script.end_frame(),
+    }
+
+
+def collect(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".jsonl"):
+                    files.append(os.path.join(path, name))
+        else:
+            files.append(path)
+    return files
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Verify submitted scores by replaying input logs")
+    parser.add_argument("paths", nargs="+", help="файлы записей или папки с *.jsonl")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", help="записать вердикты в JSONL")
+    parser.add_argument("--max-frames", type=int, default=MAX_FRAMES,
+                        help="самая длинная допустимая запись в кадрах (длиннее — отклоняется)")
+    parser.add_argument("--legacy-list",
+                        help="файл с именами записей (по одному в строке), принятых до "
+                             "смены правил: они не проверяются, но и не отклоняются")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    files = collect(args.paths)
+    if not files:
+        print("No replays found")
+        return 1
+
+    legacy = frozenset()
+    if args.legacy_list:
+        with open(args.legacy_list) as f:
+            legacy = frozenset(line.strip() for line in f if line.strip())
+
+    started = time.perf_counter()
+    with Pool(args.workers) as pool:
+        verdicts = list(pool.imap_unordered(partial(verify, legacy=legacy, max_frames=args.max_frames), files, chunksize=4))
+    elapsed = time.perf_counter() - started
+
+    rejected = [verdict for verdict in verdicts if verdict["valid"] is False]
+    outdated = [verdict for verdict in verdicts if verdict["valid"] is None]
+    for verdict in rejected:
+        reason = verdict.get("error") or (
+            f"claimed {verdict['claimed_best']}, replay gives {verdict['actual_best']}"
+        )
+        print(f"  ✗ {verdict['file']}: {reason}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            for verdict in verdicts:
+                f.write(json.dumps(verdict) + "\n")
+
+    frames = sum(verdict.get("frames", 0) for verdict in verdicts)
+    valid = len(verdicts) - len(rejected) - len(outdated)
+    print(f"Verified {len(verdicts)} replays: {valid} valid, {len(rejected)} rejected, "
+          f"{len(outdated)} legacy under other rules (current: v{RULES_VERSION})")
+    print(f"{elapsed:.2f}s on {args.workers} workers = {len(verdicts) / elapsed:.1f} replays/s, "
+          f"{frames / elapsed:.0f} frames/s")
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())